@@ -1,7 +1,21 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+import plotly.express as px
+from datetime import date, datetime, timedelta
+from collections import OrderedDict
+from contextlib import closing
+from itertools import islice
+from functools import partial, wraps
+import asyncio
+import hashlib
+import json
+import os
 import re
+import sqlite3
+import random
+import threading
+import time
+import requests
 
 # ========================================
 # CONFIGURATION - ADD YOUR CREDENTIALS HERE
@@ -11,24 +25,263 @@ import re
 SUPABASE_URL = "https://jqffwokcwmsbnlajhoah.supabase.co"  # Replace with your Supabase URL
 SUPABASE_KEY = "sb_publishable_CfyVSnj3E0k2fYFUeGaE9w_k89GEjVE"  # Replace with your Supabase anon/public key
 
+# Supabase Connection Configuration (one pooled client is shared by every session)
+SUPABASE_POOL_SIZE = 20  # Maximum open HTTP connections to Supabase
+SUPABASE_KEEPALIVE_SECONDS = 30  # How long an idle pooled connection stays open
+SUPABASE_TIMEOUT_SECONDS = 10  # Per-request timeout
+SUPABASE_MAX_RETRIES = 3  # Retries of a request that failed with a transient error
+SUPABASE_RETRY_BASE_SECONDS = 0.2  # Backoff ceiling for the first retry, doubled per retry (full jitter)
+SUPABASE_BREAKER_THRESHOLD = 5  # Consecutive transient failures that open the circuit breaker
+SUPABASE_BREAKER_COOLDOWN_SECONDS = 30  # How long an open breaker fails fast before letting a trial request through
+
 # Platzi API Configuration
 PLATZI_API_BASE = "https://api.platzi.com/graphql"
+PLATZI_IMPORT_BATCH_SIZE = 100  # Courses sent per bulk upsert request
+PLATZI_PAGE_SIZE = 50  # Courses requested per catalog page
+PLATZI_MAX_COURSES = 5000  # Safety cap on a full catalog walk
+PLATZI_CACHE_DIR = ".platzi_cache"  # On-disk cache of catalog pages
+PLATZI_CACHE_TTL_SECONDS = 3600  # Cached pages are used without contacting Platzi for this long
+PLATZI_DISPLAY_LIMIT = 50  # Courses rendered as expanders on the import page
+
+# Data Cache Configuration
+CACHE_TTL_SECONDS = 60  # How long cached table reads stay fresh
+CACHE_MAX_ENTRIES = 32  # Maximum cached reads kept per session
+
+# Pagination Configuration
+PAGE_SIZE_OPTIONS = [25, 50, 100]  # Rows per page offered in list views
+
+# Column projections per view, so each page fetches only the fields it renders.
+# Paginated projections must include created_at and id (the keyset cursor).
+CUSTOMER_COLUMNS = {
+    "list": "id, name, email, phone, city, state, created_at",
+    "options": "id, name, email",
+    "count": "id",
+    "detail": "*"
+}
+PRODUCT_COLUMNS = {
+    "list": "id, name, sku, price, cost, stock_quantity, category, created_at",
+    "options": "id, name, sku, price, stock_quantity",
+    "valuation": "id, price, stock_quantity",
+    "alerts": "id, name, sku, stock_quantity, category",
+    "count": "id",
+    "detail": "*"
+}
+
+# Inventory Configuration
+LOW_STOCK_THRESHOLD = 10  # Products at or below this stock level raise an alert
+LOW_STOCK_CATEGORY_THRESHOLDS = {}  # Per-category overrides, e.g. {"Electronics": 5}; None never alerts
+LOW_STOCK_ALERT_LIMIT = 50  # Most low-stock products listed at once (the count covers all of them)
+
+# Search Configuration
+SEARCH_RESULT_LIMIT = 50  # Maximum matches returned by a search
+PICKER_RESULT_LIMIT = 20  # Maximum options offered by a typeahead picker
+
+# Data Sync Configuration
+# With sync on, every list, search, count and dashboard read is served from process-wide local copies
+DATA_SYNC_MODE = "off"  # "off" (query per read), "delta" (poll updated_at deltas) or "realtime" (Postgres change events)
+SYNC_INTERVAL_SECONDS = 5  # Minimum time between delta refreshes of a table
+SYNC_RECONCILE_SECONDS = 300  # How often a full id listing catches upstream deletes
+SYNC_OVERLAP_SECONDS = 30  # Deltas re-read this far behind the watermark to catch late-committing transactions
+SYNC_BATCH_SIZE = 1000  # Rows fetched per sync request (PostgREST's default max-rows)
+SYNC_TABLES = ("customers", "products", "orders")
+SYNC_CASCADES = {"customers": ("orders", "customer_id"), "products": ("orders", "product_id")}
+
+# Reporting Replica Configuration
+REPLICA_PATH = "dropshipping_replica.db"  # Local SQLite mirror used when AGGREGATION_MODE = "replica"
+REPLICA_REFRESH_SECONDS = 60  # Minimum time between incremental replica refreshes
+
+# File Import Configuration
+FILE_IMPORT_CHUNK_SIZE = 5000  # Rows read and validated per chunk
+FILE_IMPORT_BATCH_SIZE = 500  # Rows sent per bulk upsert request
+
+# Export Configuration
+EXPORT_DIR = "exports"  # Where export files are written
+EXPORT_CHUNK_SIZE = 1000  # Rows fetched and written per export chunk
+EXPORT_DOWNLOAD_MAX_MB = 50  # Larger exports are only offered by path, not through the browser
+EXPORT_COLUMNS = {
+    "customers": "*",
+    "products": "*",
+    "orders": "*, customers(name, email, phone), products(name, sku, price)"
+}
+EXPORT_COLUMN_TYPES = {  # Parquet types of numeric columns, used when a column's first chunk is all NULL
+    "id": "int64", "customer_id": "int64", "product_id": "int64", "group_id": "int64",
+    "quantity": "int64", "stock_quantity": "int64",
+    "price": "double", "cost": "double", "total_amount": "double", "products_price": "double"
+}
+
+# Dashboard Configuration
+AGGREGATION_MODE = "database"  # "database" (SQL views/RPC), "client" (aggregate in Python) or "replica" (local SQLite)
+DASHBOARD_TOP_N = 5  # Number of top products and recent orders shown
+SALES_TREND_PERIODS = [30, 90, 365]  # Days of history offered by the dashboard trend charts
+
+# Instrumentation Configuration
+INSTRUMENTATION_ENABLED = False  # Record timing, rows and payload size of every data call
+INSTRUMENTATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)  # Latency histogram bounds
 
 # ========================================
 # INITIALIZE SUPABASE CLIENT
 # ========================================
 
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while Supabase is considered down"""
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated transient failures instead of letting every
+    session block on a degraded backend. Once the cooldown passes, one
+    trial request is let through; its outcome closes or re-opens the breaker.
+    """
+    
+    def __init__(self, threshold=SUPABASE_BREAKER_THRESHOLD, cooldown=SUPABASE_BREAKER_COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        """Whether a request may be sent now"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.opened_at = time.monotonic()  # One trial request per cooldown
+                return True
+            return False
+    
+    def record_success(self):
+        """Close the breaker after a request the backend answered"""
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        """Count a transient failure, opening the breaker at the threshold"""
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+# Transient failures that are safe to retry for any request: it never reached
+# the database, or PostgREST refused it before running it
+_RETRY_ANY_CODES = {"429", "503", "PGRST000", "PGRST001", "PGRST002"}
+# Failures after which a write may or may not have happened: retried only for reads
+_RETRY_IDEMPOTENT_CODES = {"502", "504", "520"}
+
+def _is_idempotent(builder):
+    """Whether a postgrest request builder sends a GET/HEAD request"""
+    request = getattr(builder, "request", builder)
+    return getattr(request, "http_method", "GET") in ("GET", "HEAD")
+
+def _is_transient(error):
+    """Whether a failure points at the network or a degraded backend rather than the request"""
+    import httpx
+    
+    code = str(getattr(error, "code", ""))
+    return isinstance(error, httpx.TransportError) or code in _RETRY_ANY_CODES | _RETRY_IDEMPOTENT_CODES
+
+def _is_safe_to_retry(error, idempotent):
+    """Whether resending cannot apply a write twice"""
+    import httpx
+    
+    if idempotent or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    return str(getattr(error, "code", "")) in _RETRY_ANY_CODES
+
+def execute_with_retry(builder, breaker):
+    """Execute a request builder, retrying transient failures with jittered exponential backoff"""
+    if not breaker.allow():
+        raise CircuitOpenError("Supabase is temporarily unavailable, please try again shortly")
+    if hasattr(builder, "retry"):
+        builder.retry(False)  # postgrest's own fixed-delay retry would stack with ours
+    
+    idempotent = _is_idempotent(builder)
+    for attempt in range(SUPABASE_MAX_RETRIES + 1):
+        try:
+            response = builder.execute()
+        except Exception as e:
+            if not _is_transient(e):
+                breaker.record_success()  # The backend answered; the request itself was bad
+                raise
+            if attempt == SUPABASE_MAX_RETRIES or not _is_safe_to_retry(e, idempotent):
+                breaker.record_failure()
+                raise
+            time.sleep(random.uniform(0, SUPABASE_RETRY_BASE_SECONDS * 2 ** attempt))
+        else:
+            breaker.record_success()
+            return response
+
+class _ResilientQuery:
+    """Wraps a postgrest request builder so that execute() goes through execute_with_retry"""
+    
+    def __init__(self, builder, breaker):
+        self._builder = builder
+        self._breaker = breaker
+    
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if hasattr(attr, "execute"):
+            return _ResilientQuery(attr, self._breaker)  # e.g. the not_ property
+        if not callable(attr):
+            return attr
+        
+        @wraps(attr)
+        def chained(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return _ResilientQuery(result, self._breaker) if hasattr(result, "execute") else result
+        return chained
+    
+    def execute(self):
+        return execute_with_retry(self._builder, self._breaker)
+
+class ResilientSupabase:
+    """Supabase client whose table() and rpc() requests retry transient errors behind a circuit breaker"""
+    
+    def __init__(self, client, breaker=None):
+        self._client = client
+        self.breaker = breaker or CircuitBreaker()
+    
+    def table(self, name):
+        return _ResilientQuery(self._client.table(name), self.breaker)
+    
+    def rpc(self, fn, params=None, **kwargs):
+        return _ResilientQuery(self._client.rpc(fn, params or {}, **kwargs), self.breaker)
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+@st.cache_resource
+def get_supabase_client(url, key):
+    """
+    One Supabase client per process, shared by every session and rerun.
+    
+    Requests go through a single pooled httpx client, so TCP connections and
+    TLS sessions are reused across interactions and users.
+    """
+    import httpx
+    from supabase import create_client, ClientOptions
+    
+    http_client = httpx.Client(
+        base_url=f"{url}/rest/v1",
+        limits=httpx.Limits(
+            max_connections=SUPABASE_POOL_SIZE,
+            max_keepalive_connections=SUPABASE_POOL_SIZE,
+            keepalive_expiry=SUPABASE_KEEPALIVE_SECONDS
+        ),
+        timeout=httpx.Timeout(SUPABASE_TIMEOUT_SECONDS),
+        follow_redirects=True
+    )
+    client = create_client(url, key, options=ClientOptions(httpx_client=http_client))
+    return ResilientSupabase(client)
+
 def init_supabase():
     """Initialize Supabase client with error handling"""
     try:
-        from supabase import create_client, Client
-        
         if "supabase.co" not in SUPABASE_URL or len(SUPABASE_KEY) < 20:
             st.error("⚠️ Please update SUPABASE_URL and SUPABASE_KEY in the code!")
             return None
-            
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        return supabase
+        
+        return get_supabase_client(SUPABASE_URL, SUPABASE_KEY)
     except ImportError:
         st.error("❌ Supabase library not installed! Run: pip install supabase")
         return None
@@ -36,30 +289,765 @@ def init_supabase():
         st.error(f"❌ Failed to connect to Supabase: {e}")
         return None
 
+# ========================================
+# INSTRUMENTATION
+# ========================================
+
+# Per-thread call context: the page being rendered and the stack of
+# instrumented calls in progress (Streamlit runs each session in its own thread)
+_call_context = threading.local()
+
+@st.cache_resource
+def _metrics_store():
+    """Process-wide call metrics keyed by (page, function), shared by every session"""
+    return {"lock": threading.Lock(), "calls": {}}
+
+def set_instrumented_page(page):
+    """Attribute the calls made while rendering this script run to page"""
+    _call_context.page = page
+
+def _result_payload(result):
+    """The rows part of a data function's return value"""
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return result[0]  # (rows, next_cursor) from the page readers
+    if isinstance(result, (list, dict)):
+        return result
+    return None
+
+def _record_call(page, function, elapsed_ms, ok, payload):
+    """Add one call to the (page, function) aggregates"""
+    rows = len(payload) if isinstance(payload, list) else int(payload is not None)
+    size = len(json.dumps(payload, default=str)) if payload is not None else 0
+    store = _metrics_store()
+    with store["lock"]:
+        stats = store["calls"].setdefault((page, function), {
+            "calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "bytes": 0,
+            "buckets": [0] * (len(INSTRUMENTATION_BUCKETS_MS) + 1)
+        })
+        stats["calls"] += 1
+        stats["errors"] += 0 if ok else 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["rows"] += rows
+        stats["bytes"] += size
+        bucket = next((i for i, bound in enumerate(INSTRUMENTATION_BUCKETS_MS) if elapsed_ms <= bound),
+                      len(INSTRUMENTATION_BUCKETS_MS))
+        stats["buckets"][bucket] += 1
+
+def instrumented(func):
+    """
+    Record wall time, rows returned, approximate response bytes and success of each call.
+    
+    A call fails when it raises, returns (False, ...) or reports a read error
+    through _report_read_error. With INSTRUMENTATION_ENABLED off the wrapper
+    only checks the flag.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not INSTRUMENTATION_ENABLED:
+            return func(*args, **kwargs)
+        
+        if not hasattr(_call_context, "stack"):
+            _call_context.stack = []
+        call = {"ok": True}
+        _call_context.stack.append(call)
+        started = time.perf_counter()
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            if isinstance(result, tuple) and result and result[0] is False:
+                call["ok"] = False
+            return result
+        except Exception:
+            call["ok"] = False
+            raise
+        finally:
+            _call_context.stack.pop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            page = getattr(_call_context, "page", "Background")
+            _record_call(page, func.__name__, elapsed_ms, call["ok"], _result_payload(result))
+    return wrapper
+
+def _report_read_error(message):
+    """Show a failed read and mark the instrumented call in progress as failed"""
+    stack = getattr(_call_context, "stack", None)
+    if stack:
+        stack[-1]["ok"] = False
+    st.error(message)
+
+def get_call_metrics():
+    """Snapshot of the call aggregates as a list of dicts, one per (page, function)"""
+    store = _metrics_store()
+    with store["lock"]:
+        return [
+            {"page": page, "function": function, **stats, "buckets": list(stats["buckets"])}
+            for (page, function), stats in sorted(store["calls"].items())
+        ]
+
+def reset_call_metrics():
+    """Forget every recorded call"""
+    store = _metrics_store()
+    with store["lock"]:
+        store["calls"].clear()
+
+def export_metrics_json():
+    """Call aggregates as JSON, with the histogram bucket bounds"""
+    return json.dumps({"buckets_ms": list(INSTRUMENTATION_BUCKETS_MS), "calls": get_call_metrics()}, indent=2)
+
+def _prometheus_labels(page, function, **extra):
+    """Render a Prometheus label set, escaping backslashes, quotes and newlines"""
+    labels = {"page": page, "function": function, **extra}
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+def export_metrics_prometheus():
+    """Call aggregates in the Prometheus text exposition format"""
+    metrics = get_call_metrics()
+    lines = [
+        "# HELP dropshipping_call_duration_seconds Wall time of data function calls.",
+        "# TYPE dropshipping_call_duration_seconds histogram"
+    ]
+    for m in metrics:
+        cumulative = 0
+        for bound, count in zip(INSTRUMENTATION_BUCKETS_MS + (None,), m["buckets"]):
+            cumulative += count
+            le = "+Inf" if bound is None else f"{bound / 1000:g}"
+            lines.append(f"dropshipping_call_duration_seconds_bucket{_prometheus_labels(m['page'], m['function'], le=le)} {cumulative}")
+        labels = _prometheus_labels(m["page"], m["function"])
+        lines.append(f"dropshipping_call_duration_seconds_sum{labels} {m['total_ms'] / 1000:.6f}")
+        lines.append(f"dropshipping_call_duration_seconds_count{labels} {m['calls']}")
+    
+    for name, field, help_text in (
+        ("dropshipping_call_errors_total", "errors", "Data function calls that failed."),
+        ("dropshipping_call_rows_total", "rows", "Rows returned by data function calls."),
+        ("dropshipping_call_response_bytes_total", "bytes", "Approximate JSON size of returned rows.")
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        lines += [f"{name}{_prometheus_labels(m['page'], m['function'])} {m[field]}" for m in metrics]
+    return "\n".join(lines) + "\n"
+
+# ========================================
+# DATA CACHE
+# ========================================
+
+def _get_data_cache():
+    """Return this session's data cache, creating it on first use"""
+    if "data_cache" not in st.session_state:
+        st.session_state["data_cache"] = OrderedDict()
+    return st.session_state["data_cache"]
+
+def cache_get(key):
+    """Return cached rows for key, or None if missing or expired"""
+    cache = _get_data_cache()
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    
+    stored_at, data = entry
+    if time.monotonic() - stored_at > CACHE_TTL_SECONDS:
+        del cache[key]
+        return None
+    
+    cache.move_to_end(key)
+    return data
+
+def cache_set(key, data):
+    """Store rows under key, evicting the least recently used entries"""
+    cache = _get_data_cache()
+    cache[key] = (time.monotonic(), data)
+    cache.move_to_end(key)
+    while len(cache) > CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+
+def invalidate_cache(*tables):
+    """Drop every cached read for the given tables"""
+    cache = _get_data_cache()
+    for key in [k for k in cache if k[0] in tables]:
+        del cache[key]
+    _mark_sync_stale(*tables)
+
+def _patch_cached_rows(table, row_ids, changes):
+    """
+    Apply changes to rows in the cached full-table reads of table.
+    
+    Pages and aggregates derived from the table can't be patched safely
+    (filters and sums may change), so they are dropped instead.
+    """
+    _mark_sync_stale(table)
+    cache = _get_data_cache()
+    for key, (stored_at, data) in list(cache.items()):
+        if key[0] != table:
+            continue
+        if key[1] != "all":
+            del cache[key]
+            continue
+        for row in data:
+            if row.get('id') in row_ids:
+                row.update({k: v for k, v in changes.items() if k in row})
+
+def _drop_cached_rows(table, row_ids):
+    """Remove rows from the cached full-table reads of table, dropping derived reads"""
+    _sync_forget(table, row_ids)
+    cache = _get_data_cache()
+    for key, (stored_at, data) in list(cache.items()):
+        if key[0] != table:
+            continue
+        if key[1] != "all":
+            del cache[key]
+            continue
+        cache[key] = (stored_at, [row for row in data if row.get('id') not in row_ids])
+
+# ========================================
+# PAGINATION
+# ========================================
+
+def _fetch_page(supabase, table, columns, page_size, cursor=None, filters=None):
+    """
+    Fetch one page of rows ordered by (created_at, id) descending.
+    
+    cursor is the (created_at, id) of the last row on the previous page, so
+    each page is a bounded index scan no matter how deep the user navigates.
+    filters is a {"column.op": value} dict as built by _apply_filters.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if DATA_SYNC_MODE != "off":
+        return get_synced_page(supabase, table, columns, page_size, cursor, filters)
+    
+    key = (table, "page", columns, page_size, cursor, _filter_key(filters))
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    page = _query_page(supabase, table, columns, page_size, cursor, filters)
+    cache_set(key, page)
+    return page
+
+def _query_page(supabase, table, columns, page_size, cursor=None, filters=None):
+    """Uncached _fetch_page, for bulk reads that would only churn the session cache"""
+    query = _apply_filters(supabase.table(table).select(columns), filters)
+    if cursor:
+        created_at, row_id = cursor
+        query = query.or_(
+            f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
+        )
+    
+    # Ask for one extra row to learn whether another page exists
+    response = query.order("created_at", desc=True).order("id", desc=True).limit(page_size + 1).execute()
+    rows = response.data[:page_size]
+    next_cursor = None
+    if len(response.data) > page_size:
+        next_cursor = (rows[-1]['created_at'], rows[-1]['id'])
+    return rows, next_cursor
+
+def _apply_filters(query, filters):
+    """Add {"column.op": value} filters to a query (op is in, gte or lt; in takes a tuple)"""
+    for name, value in (filters or {}).items():
+        column, op = name.rsplit(".", 1)
+        query = query.in_(column, list(value)) if op == "in" else getattr(query, op)(column, value)
+    return query
+
+def _row_matches(row, filters):
+    """Client-side check of _apply_filters filters, for rows read from the local copy"""
+    for name, value in filters.items():
+        column, op = name.rsplit(".", 1)
+        field = row.get(column)
+        if op == "in":
+            if field not in value:
+                return False
+        elif field is None or not (field >= value if op == "gte" else field < value):
+            return False
+    return True
+
+def _filter_key(filters):
+    """Hashable form of a filters dict for cache keys"""
+    return tuple(sorted((filters or {}).items()))
+
+# ========================================
+# DATA SYNC
+# ========================================
+
+def _sync_since(watermark):
+    """The watermark moved SYNC_OVERLAP_SECONDS back"""
+    return (datetime.fromisoformat(watermark) - timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat()
+
+def iter_changed_rows(supabase, table, watermark=None):
+    """
+    Yield batches of rows changed at or after watermark, oldest first.
+    
+    updated_at is stamped with NOW(), the transaction's start time, so a
+    transaction that started before the last pull but committed after it
+    lands behind the watermark. The first request therefore re-reads from
+    SYNC_OVERLAP_SECONDS before it; callers merge by id, so the overlap
+    only costs the re-sent rows. Later batches continue from an
+    (updated_at, id) keyset cursor.
+    """
+    cursor = None
+    while True:
+        query = supabase.table(table).select("*")
+        if cursor:
+            updated_at, row_id = cursor
+            query = query.or_(
+                f'updated_at.gt."{updated_at}",and(updated_at.eq."{updated_at}",id.gt.{row_id})'
+            )
+        elif watermark:
+            query = query.gte("updated_at", _sync_since(watermark))
+        
+        response = query.order("updated_at").order("id").limit(SYNC_BATCH_SIZE).execute()
+        if response.data:
+            yield response.data
+            cursor = (response.data[-1]['updated_at'], response.data[-1]['id'])
+        
+        if len(response.data) < SYNC_BATCH_SIZE:
+            break
+
+def fetch_live_ids(supabase, table):
+    """Return every id currently in table, listed in id-keyset batches"""
+    live_ids = set()
+    last_id = None
+    while True:
+        query = supabase.table(table).select("id")
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        response = query.order("id").limit(SYNC_BATCH_SIZE).execute()
+        live_ids.update(row['id'] for row in response.data)
+        if len(response.data) < SYNC_BATCH_SIZE:
+            break
+        last_id = response.data[-1]['id']
+    return live_ids
+
+class TableSync:
+    """
+    Process-wide local copy of one table, refreshed with updated_at deltas.
+    
+    Each refresh pulls only rows whose updated_at is at or after the last
+    watermark and merges them by id. Deletes never show up in a delta, so
+    every SYNC_RECONCILE_SECONDS a reconcile pass lists the table's ids and
+    drops local rows that are gone.
+    """
+    
+    def __init__(self, table):
+        self.table = table
+        self.rows = {}
+        self.watermark = None
+        self.stale = True
+        self.last_refresh = 0.0
+        self.last_reconcile = 0.0
+        self.lock = threading.Lock()
+        self._snapshot = None
+    
+    def refresh(self, supabase, poll=True):
+        """
+        Bring the local copy up to date when a refresh is due or it was marked stale.
+        
+        With poll off (realtime mode, where change events keep the copy current)
+        only a stale copy is refreshed and the reconcile pass is skipped.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if not self.stale and (not poll or now - self.last_refresh < SYNC_INTERVAL_SECONDS):
+                return
+            self._pull_changes(supabase)
+            if poll and now - self.last_reconcile >= SYNC_RECONCILE_SECONDS:
+                self._reconcile(supabase)
+                self.last_reconcile = now
+            self.last_refresh = now
+            self.stale = False
+    
+    def _pull_changes(self, supabase):
+        """Merge every row changed since the watermark"""
+        for batch in iter_changed_rows(supabase, self.table, self.watermark):
+            for row in batch:
+                self.rows[row['id']] = row
+            self.watermark = batch[-1]['updated_at']
+            self._snapshot = None
+    
+    def _reconcile(self, supabase):
+        """Drop local rows whose ids no longer exist upstream"""
+        live_ids = fetch_live_ids(supabase, self.table)
+        for row_id in set(self.rows) - live_ids:
+            del self.rows[row_id]
+            self._snapshot = None
+    
+    def apply_change(self, change_type, record=None, old_record=None):
+        """Apply one INSERT, UPDATE or DELETE change event to the local copy"""
+        with self.lock:
+            if change_type == "DELETE":
+                self.rows.pop((old_record or {}).get('id'), None)
+            elif record:
+                self.rows[record['id']] = record
+                if record.get('updated_at') and (self.watermark is None or record['updated_at'] > self.watermark):
+                    self.watermark = record['updated_at']
+            self._snapshot = None
+    
+    def forget(self, row_ids=None, where=None):
+        """Remove rows deleted by this process, by id or by predicate"""
+        with self.lock:
+            for row_id, row in list(self.rows.items()):
+                if (row_ids is not None and row_id in row_ids) or (where is not None and where(row)):
+                    del self.rows[row_id]
+                    self._snapshot = None
+    
+    def snapshot(self):
+        """All rows newest first, re-sorted only after the copy changes"""
+        with self.lock:
+            if self._snapshot is None:
+                self._snapshot = sorted(
+                    self.rows.values(),
+                    key=lambda row: (row.get('created_at') or '', row['id']),
+                    reverse=True
+                )
+            return self._snapshot
+
+@st.cache_resource
+def get_sync_engine():
+    """Process-wide local copies of the synced tables, shared by every session"""
+    return {table: TableSync(table) for table in SYNC_TABLES}
+
+def _mark_sync_stale(*tables):
+    """Make the next read of these tables pull deltas immediately"""
+    if AGGREGATION_MODE == "replica":
+        _replica_state()["stale"] = True
+    if DATA_SYNC_MODE == "off":
+        return
+    engine = get_sync_engine()
+    for table in tables:
+        if table in engine:
+            engine[table].stale = True
+
+def _mark_all_sync_stale():
+    """Force a delta pull of every table, e.g. after change events may have been missed"""
+    _mark_sync_stale(*SYNC_TABLES)
+
+def _sync_forget(table, row_ids):
+    """Drop deleted rows (and rows that cascade with them) from the local copies"""
+    if AGGREGATION_MODE == "replica":
+        replica_forget(table, row_ids)
+    if DATA_SYNC_MODE == "off":
+        return
+    engine = get_sync_engine()
+    engine[table].forget(row_ids=set(row_ids))
+    if table in SYNC_CASCADES:
+        child_table, foreign_key = SYNC_CASCADES[table]
+        engine[child_table].forget(where=lambda row: row.get(foreign_key) in row_ids)
+
+def _project(rows, columns):
+    """Keep only the requested comma-separated columns of each row"""
+    if columns == "*":
+        return rows
+    names = [name.strip() for name in columns.split(",")]
+    return [{name: row.get(name) for name in names} for row in rows]
+
+def get_synced_rows(supabase, table, columns="*"):
+    """Read a table from the local copy, pulling deltas first when due"""
+    store = get_sync_engine()[table]
+    try:
+        if DATA_SYNC_MODE == "realtime":
+            # Fall back to delta polling whenever the subscription isn't live
+            store.refresh(supabase, poll=not ensure_change_feed())
+        else:
+            store.refresh(supabase)
+    except Exception as e:
+        # Serve the last synced copy rather than nothing
+        _report_read_error(f"❌ Error syncing {table}: {e}")
+    return _project(store.snapshot(), columns)
+
+@st.cache_resource
+def _synced_memo():
+    """Process-wide results derived from the local copies, keyed on the snapshots they came from"""
+    return {}
+
+def _memoize(name, sources, build):
+    """
+    Return build() for these snapshot lists, rebuilding only after one of them changes.
+    
+    Snapshots are replaced (never mutated) when their table changes, and the
+    memo keeps them alive, so comparing identities is enough.
+    """
+    memo = _synced_memo()
+    entry = memo.get(name)
+    if entry is None or len(entry[0]) != len(sources) or any(a is not b for a, b in zip(entry[0], sources)):
+        entry = (sources, build())
+        memo[name] = entry
+    return entry[1]
+
+def get_synced_orders(supabase):
+    """Orders from the local copy, embedding customer and product fields like get_all_orders"""
+    customer_rows = get_synced_rows(supabase, "customers")
+    product_rows = get_synced_rows(supabase, "products")
+    order_rows = get_synced_rows(supabase, "orders")
+    
+    def embed():
+        customers = {c['id']: c for c in customer_rows}
+        products = {p['id']: p for p in product_rows}
+        orders = []
+        for order in order_rows:
+            customer = customers.get(order.get('customer_id'))
+            product = products.get(order.get('product_id'))
+            orders.append({
+                **order,
+                "customers": {k: customer.get(k) for k in ("name", "email", "phone")} if customer else None,
+                "products": {k: product.get(k) for k in ("name", "sku", "price")} if product else None
+            })
+        return orders
+    return _memoize("orders", [customer_rows, product_rows, order_rows], embed)
+
+def get_synced_orders_frame(supabase):
+    """build_orders_frame of the synced orders, rebuilt only after they change"""
+    orders = get_synced_orders(supabase)
+    return _memoize("orders_frame", [orders], lambda: build_orders_frame(orders))
+
+def get_synced_row(supabase, table, row_id):
+    """One row of the local copy by id, or None"""
+    get_synced_rows(supabase, table)  # Pull deltas first when due
+    store = get_sync_engine()[table]
+    with store.lock:
+        return store.rows.get(row_id)
+
+def _synced_table(supabase, table):
+    """Local copy of a table newest first (orders with embedded customer and product fields)"""
+    return get_synced_orders(supabase) if table == "orders" else get_synced_rows(supabase, table)
+
+def get_synced_page(supabase, table, columns, page_size, cursor=None, filters=None):
+    """_fetch_page served from the local copy: the same filters, (created_at, id) cursor and projection"""
+    rows = (row for row in _synced_table(supabase, table) if not filters or _row_matches(row, filters))
+    if cursor:
+        rows = (row for row in rows if ((row.get('created_at') or ""), row['id']) < tuple(cursor))
+    page = list(islice(rows, page_size + 1))
+    rows = page[:page_size]
+    next_cursor = (rows[-1]['created_at'], rows[-1]['id']) if len(page) > page_size else None
+    # Embedded selects (orders) keep the whole row, like get_all_orders
+    return (rows if "(" in columns else _project(rows, columns)), next_cursor
+
+def count_synced_rows(supabase, table, filters=None):
+    """count_rows served from the local copy"""
+    rows = get_synced_rows(supabase, table)
+    return sum(1 for row in rows if _row_matches(row, filters)) if filters else len(rows)
+
+def search_synced_rows(supabase, table, fields, term, columns, limit, prefix=False):
+    """
+    Case-insensitive "contains" (or "starts with") match of term on fields, served from the local copy.
+    
+    Matches are ordered by name like the PostgREST searches; an empty term
+    returns the newest rows.
+    """
+    rows = get_synced_rows(supabase, table)
+    term = term.lower()
+    if term:
+        def matches(value):
+            value = str(value or "").lower()
+            return value.startswith(term) if prefix else term in value
+        rows = sorted(
+            (row for row in rows if any(matches(row.get(field)) for field in fields)),
+            key=lambda row: row.get('name') or ""
+        )
+    return _project(rows[:limit], columns)
+
+# ========================================
+# REALTIME CHANGE FEED
+# ========================================
+
+def _normalize_change(payload):
+    """Flatten a Supabase Realtime postgres_changes payload into a change dict"""
+    data = payload.get("data", payload)
+    change_type = data.get("type") or data.get("eventType")
+    return {
+        "table": data["table"],
+        "type": getattr(change_type, "value", change_type),
+        "record": data.get("record") or data.get("new") or None,
+        "old_record": data.get("old_record") or data.get("old") or None
+    }
+
+class SupabaseRealtimeFeed:
+    """
+    Postgres change events for the synced tables from Supabase Realtime.
+    
+    Realtime is asyncio-only in supabase-py, so the subscription runs its own
+    event loop on a daemon thread and hands each change to on_change.
+    subscribed tells whether events are flowing; if the listener dies, the
+    exception is kept in error and failed turns true.
+    """
+    
+    def __init__(self, url, key, tables=SYNC_TABLES):
+        self.url = url
+        self.key = key
+        self.tables = tables
+        self.subscribed = False
+        self.error = None
+        self._loop = None
+        self._stopped = None
+        self._thread = None
+    
+    @property
+    def failed(self):
+        return self._thread is not None and not self._thread.is_alive() and self.error is not None
+    
+    def start(self, on_change, on_gap=None):
+        self._thread = threading.Thread(
+            target=asyncio.run,
+            args=(self._listen(on_change, on_gap),),
+            name="supabase-realtime",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+    
+    async def _listen(self, on_change, on_gap):
+        try:
+            from supabase import acreate_client
+            from realtime.types import RealtimeSubscribeStates
+            
+            self._loop = asyncio.get_running_loop()
+            self._stopped = asyncio.Event()
+            
+            def on_state(state, error):
+                self.subscribed = state == RealtimeSubscribeStates.SUBSCRIBED
+                if error:
+                    self.error = error
+                # Events may have been missed while not subscribed
+                if not self.subscribed and on_gap:
+                    on_gap()
+            
+            client = await acreate_client(self.url, self.key)
+            channel = client.channel("dropshipping-changes")
+            for table in self.tables:
+                channel.on_postgres_changes(
+                    "*",
+                    schema="public",
+                    table=table,
+                    callback=lambda payload: on_change(_normalize_change(payload))
+                )
+            await channel.subscribe(on_state)
+            await self._stopped.wait()
+            await client.remove_all_channels()
+        except Exception as e:
+            # Keep the error for ensure_change_feed to report; the thread ends and the feed is replaced
+            self.error = e
+            if on_gap:
+                on_gap()
+        finally:
+            self.subscribed = False
+
+class FakeChangeFeed:
+    """Local change feed for tests and benchmarks: emit() delivers a change synchronously"""
+    
+    def __init__(self):
+        self.on_change = None
+        self.on_gap = None
+        self.subscribed = False
+        self.error = None
+        self.failed = False
+    
+    def start(self, on_change, on_gap=None):
+        self.on_change = on_change
+        self.on_gap = on_gap
+        self.subscribed = True
+    
+    def stop(self):
+        self.on_change = None
+        self.subscribed = False
+    
+    def emit(self, table, change_type, record=None, old_record=None):
+        if self.on_change:
+            self.on_change({"table": table, "type": change_type, "record": record, "old_record": old_record})
+
+def apply_change_event(change):
+    """Route a normalized change event to the synced copy of its table"""
+    store = get_sync_engine().get(change["table"])
+    if store is not None:
+        store.apply_change(change["type"], change.get("record"), change.get("old_record"))
+
+@st.cache_resource
+def _change_feed_slot():
+    """Process-wide holder for the active change feed"""
+    return {"feed": None, "lock": threading.Lock()}
+
+def start_change_feed(feed):
+    """Attach a change feed (Supabase Realtime or a fake) to the synced tables, replacing any other"""
+    slot = _change_feed_slot()
+    with slot["lock"]:
+        if slot["feed"] is not None:
+            slot["feed"].stop()
+        slot["feed"] = feed
+        feed.start(apply_change_event, on_gap=_mark_all_sync_stale)
+    return feed
+
+def ensure_change_feed():
+    """
+    Subscribe to Supabase Realtime the first time realtime mode needs it, and again after the listener dies.
+    
+    Returns whether change events are flowing right now; until they are,
+    readers poll for deltas instead of trusting the local copy.
+    """
+    slot = _change_feed_slot()
+    feed = slot["feed"]
+    if feed is not None and feed.failed:
+        with slot["lock"]:
+            if slot["feed"] is feed:
+                slot["feed"] = None
+        _report_read_error(f"❌ Realtime subscription failed ({feed.error}); resubscribing and polling for changes meanwhile")
+        feed = None
+    if feed is None:
+        feed = start_change_feed(SupabaseRealtimeFeed(SUPABASE_URL, SUPABASE_KEY))
+    return feed.subscribed
+
+# ========================================
+# SEARCH HELPERS
+# ========================================
+
+def _ilike_value(term, prefix=False):
+    """
+    Quote a search term as a "contains" (or "starts with") ilike pattern for PostgREST filters.
+    
+    LIKE wildcards in the term are escaped so they match literally, and the
+    value is double-quoted so commas and parentheses can't break an or_() filter.
+    """
+    pattern = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return _quote_value(f"{pattern}%" if prefix else f"%{pattern}%")
+
+def _quote_value(value):
+    """Double-quote a value so commas, dots and parentheses can't break an or_() filter"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
 # ========================================
 # VALIDATION FUNCTIONS
 # ========================================
 
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+PHONE_SEPARATORS = r'[\s\-\(\)]'
+
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return re.match(EMAIL_PATTERN, email) is not None
 
 def validate_phone(phone):
     """Validate phone number (basic validation)"""
     # Remove spaces, dashes, parentheses
-    cleaned = re.sub(r'[\s\-\(\)]', '', phone)
+    cleaned = re.sub(PHONE_SEPARATORS, '', phone)
     # Check if it's 10-15 digits
     return len(cleaned) >= 10 and len(cleaned) <= 15 and cleaned.isdigit()
 
+def valid_emails(emails):
+    """Vectorized validate_email over a string Series"""
+    return emails.str.match(EMAIL_PATTERN).fillna(False).astype(bool)
+
+def valid_phones(phones):
+    """Vectorized validate_phone over a string Series"""
+    cleaned = phones.str.replace(PHONE_SEPARATORS, '', regex=True)
+    return (cleaned.str.len().between(10, 15) & cleaned.str.isdigit()).fillna(False).astype(bool)
+
 # ========================================
 # CUSTOMER FUNCTIONS
 # ========================================
 
+@instrumented
 def add_customer(supabase, customer_data):
     """Add a new customer to Supabase"""
     try:
         response = supabase.table("customers").insert(customer_data).execute()
+        invalidate_cache("customers")
         return True, "✅ Customer added successfully!", response.data[0]['id']
     except Exception as e:
         error_msg = str(e)
@@ -67,27 +1055,123 @@ def add_customer(supabase, customer_data):
             return False, "❌ Customer with this email already exists!", None
         return False, f"❌ Error adding customer: {error_msg}", None
 
-def get_all_customers(supabase):
-    """Retrieve all customers from Supabase"""
+@instrumented
+def get_all_customers(supabase, columns="*"):
+    """Retrieve all customers from Supabase, optionally only some columns (cached per session)"""
+    if DATA_SYNC_MODE != "off":
+        return get_synced_rows(supabase, "customers", columns)
+    
+    key = ("customers", "all", columns)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("customers").select(columns).order("created_at", desc=True).execute()
+        cache_set(key, response.data)
+        return response.data
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving customers: {e}")
+        return []
+
+@instrumented
+def get_customers_page(supabase, page_size=PAGE_SIZE_OPTIONS[0], cursor=None, columns=CUSTOMER_COLUMNS["list"]):
+    """Retrieve one page of customers, newest first"""
+    try:
+        return _fetch_page(supabase, "customers", columns, page_size, cursor)
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving customers: {e}")
+        return [], None
+
+@instrumented
+def get_customer(supabase, customer_id):
+    """Retrieve the full row of a single customer (cached per session)"""
+    if DATA_SYNC_MODE != "off":
+        return get_synced_row(supabase, "customers", customer_id)
+    
+    key = ("customers", "detail", customer_id)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("customers").select(CUSTOMER_COLUMNS["detail"]).eq("id", customer_id).limit(1).execute()
+        customer = response.data[0] if response.data else None
+        if customer is not None:
+            cache_set(key, customer)
+        return customer
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving customer: {e}")
+        return None
+
+@instrumented
+def search_customers(supabase, term, limit=SEARCH_RESULT_LIMIT):
+    """Find customers whose name or email contains term, filtered in Postgres"""
+    term = term.strip()
+    if DATA_SYNC_MODE != "off":
+        return search_synced_rows(supabase, "customers", ("name", "email"), term, CUSTOMER_COLUMNS["list"], limit)
+    
+    key = ("customers", "search", term.lower(), limit)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        value = _ilike_value(term)
+        response = supabase.table("customers").select(CUSTOMER_COLUMNS["list"]).or_(
+            f"name.ilike.{value},email.ilike.{value}"
+        ).order("name").limit(limit).execute()
+        cache_set(key, response.data)
+        return response.data
+    except Exception as e:
+        _report_read_error(f"❌ Error searching customers: {e}")
+        return []
+
+@instrumented
+def search_customer_options(supabase, term="", limit=PICKER_RESULT_LIMIT):
+    """Customers for a picker: name/email prefix matches, or the newest when term is empty"""
+    term = term.strip()
+    if DATA_SYNC_MODE != "off":
+        return search_synced_rows(supabase, "customers", ("name", "email"), term, CUSTOMER_COLUMNS["options"],
+                                  limit, prefix=True)
+    
+    key = ("customers", "options", term.lower(), limit)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
     try:
-        response = supabase.table("customers").select("*").order("created_at", desc=True).execute()
+        query = supabase.table("customers").select(CUSTOMER_COLUMNS["options"])
+        if term:
+            value = _ilike_value(term, prefix=True)
+            query = query.or_(f"name.ilike.{value},email.ilike.{value}").order("name")
+        else:
+            query = query.order("created_at", desc=True)
+        response = query.limit(limit).execute()
+        cache_set(key, response.data)
         return response.data
     except Exception as e:
-        st.error(f"❌ Error retrieving customers: {e}")
+        _report_read_error(f"❌ Error searching customers: {e}")
         return []
 
+@instrumented
 def update_customer(supabase, customer_id, customer_data):
     """Update customer information"""
     try:
         response = supabase.table("customers").update(customer_data).eq("id", customer_id).execute()
+        _patch_cached_rows("customers", [customer_id], customer_data)
+        invalidate_cache("orders")  # Orders embed customer name/email/phone
         return True, "✅ Customer updated successfully!"
     except Exception as e:
         return False, f"❌ Error updating customer: {e}"
 
+@instrumented
 def delete_customer(supabase, customer_id):
     """Delete a customer"""
     try:
         supabase.table("customers").delete().eq("id", customer_id).execute()
+        _drop_cached_rows("customers", [customer_id])
+        invalidate_cache("orders")  # Orders cascade on customer delete
         return True, "✅ Customer deleted successfully!"
     except Exception as e:
         return False, f"❌ Error deleting customer: {e}"
@@ -96,10 +1180,12 @@ def delete_customer(supabase, customer_id):
 # PRODUCT FUNCTIONS
 # ========================================
 
+@instrumented
 def add_product(supabase, product_data):
     """Add a new product to Supabase"""
     try:
         response = supabase.table("products").insert(product_data).execute()
+        invalidate_cache("products")
         return True, "✅ Product added successfully!", response.data[0]['id']
     except Exception as e:
         error_msg = str(e)
@@ -107,27 +1193,100 @@ def add_product(supabase, product_data):
             return False, "❌ Product with this SKU already exists!", None
         return False, f"❌ Error adding product: {error_msg}", None
 
-def get_all_products(supabase):
-    """Retrieve all products from Supabase"""
+@instrumented
+def get_all_products(supabase, columns="*"):
+    """Retrieve all products from Supabase, optionally only some columns (cached per session)"""
+    if DATA_SYNC_MODE != "off":
+        return get_synced_rows(supabase, "products", columns)
+    
+    key = ("products", "all", columns)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("products").select(columns).order("created_at", desc=True).execute()
+        cache_set(key, response.data)
+        return response.data
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving products: {e}")
+        return []
+
+@instrumented
+def get_products_page(supabase, page_size=PAGE_SIZE_OPTIONS[0], cursor=None, columns=PRODUCT_COLUMNS["list"]):
+    """Retrieve one page of products, newest first"""
+    try:
+        return _fetch_page(supabase, "products", columns, page_size, cursor)
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving products: {e}")
+        return [], None
+
+@instrumented
+def get_product(supabase, product_id):
+    """Retrieve the full row of a single product (cached per session)"""
+    if DATA_SYNC_MODE != "off":
+        return get_synced_row(supabase, "products", product_id)
+    
+    key = ("products", "detail", product_id)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("products").select(PRODUCT_COLUMNS["detail"]).eq("id", product_id).limit(1).execute()
+        product = response.data[0] if response.data else None
+        if product is not None:
+            cache_set(key, product)
+        return product
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving product: {e}")
+        return None
+
+@instrumented
+def search_product_options(supabase, term="", limit=PICKER_RESULT_LIMIT):
+    """Products for a picker: name/SKU prefix matches, or the newest when term is empty"""
+    term = term.strip()
+    if DATA_SYNC_MODE != "off":
+        return search_synced_rows(supabase, "products", ("name", "sku"), term, PRODUCT_COLUMNS["options"],
+                                  limit, prefix=True)
+    
+    key = ("products", "options", term.lower(), limit)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
     try:
-        response = supabase.table("products").select("*").order("created_at", desc=True).execute()
+        query = supabase.table("products").select(PRODUCT_COLUMNS["options"])
+        if term:
+            value = _ilike_value(term, prefix=True)
+            query = query.or_(f"name.ilike.{value},sku.ilike.{value}").order("name")
+        else:
+            query = query.order("created_at", desc=True)
+        response = query.limit(limit).execute()
+        cache_set(key, response.data)
         return response.data
     except Exception as e:
-        st.error(f"❌ Error retrieving products: {e}")
+        _report_read_error(f"❌ Error searching products: {e}")
         return []
 
+@instrumented
 def update_product(supabase, product_id, product_data):
     """Update product information"""
     try:
         response = supabase.table("products").update(product_data).eq("id", product_id).execute()
+        _patch_cached_rows("products", [product_id], product_data)
+        invalidate_cache("orders")  # Orders embed product name/sku/price
         return True, "✅ Product updated successfully!"
     except Exception as e:
         return False, f"❌ Error updating product: {e}"
 
+@instrumented
 def delete_product(supabase, product_id):
     """Delete a product"""
     try:
         supabase.table("products").delete().eq("id", product_id).execute()
+        _drop_cached_rows("products", [product_id])
+        invalidate_cache("orders")  # Orders cascade on product delete
         return True, "✅ Product deleted successfully!"
     except Exception as e:
         return False, f"❌ Error deleting product: {e}"
@@ -136,56 +1295,187 @@ def delete_product(supabase, product_id):
 # PLATZI API FUNCTIONS
 # ========================================
 
-def fetch_platzi_courses():
-    """Fetch courses from Platzi's free public GraphQL API"""
-    query = """
-    query {
-        allCourses(limit: 20) {
-            edges {
-                node {
-                    title
-                    slug
-                    description
-                    teacher {
-                        name
-                    }
+PLATZI_COURSES_QUERY = """
+query ($first: Int!, $after: String) {
+    allCourses(first: $first, after: $after) {
+        edges {
+            node {
+                title
+                slug
+                description
+                teacher {
+                    name
                 }
             }
         }
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
     }
+}
+"""
+
+def _platzi_cache_path(query, variables):
+    """Cache file of one GraphQL request"""
+    digest = hashlib.sha256(json.dumps([query, variables], sort_keys=True).encode()).hexdigest()
+    return os.path.join(PLATZI_CACHE_DIR, f"{digest}.json")
+
+def _write_platzi_cache(path, entry):
+    """Persist a cache entry atomically, so a crash never leaves half a file behind"""
+    os.makedirs(PLATZI_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+def post_platzi_query(query, variables=None, revalidate=False):
     """
+    POST a GraphQL query to Platzi through the on-disk cache and return its data.
     
-    try:
-        response = requests.post(
-            PLATZI_API_BASE,
-            json={"query": query},
-            headers={"Content-Type": "application/json"},
-            timeout=10
+    Fresh entries (younger than PLATZI_CACHE_TTL_SECONDS) are returned without
+    a request. Stale ones are revalidated with the ETag/Last-Modified Platzi
+    sent; a 304 just renews the entry. Raises RuntimeError on API errors.
+    """
+    variables = variables or {}
+    path = _platzi_cache_path(query, variables)
+    cached = None
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None  # Unreadable entry: fetch again
+    
+    if cached and not revalidate and time.time() - cached["fetched_at"] < PLATZI_CACHE_TTL_SECONDS:
+        return cached["data"]
+    
+    headers = {"Content-Type": "application/json"}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    
+    response = requests.post(
+        PLATZI_API_BASE,
+        json={"query": query, "variables": variables},
+        headers=headers,
+        timeout=10
+    )
+    
+    if response.status_code == 304 and cached:
+        cached["fetched_at"] = time.time()
+        _write_platzi_cache(path, cached)
+        return cached["data"]
+    if response.status_code != 200:
+        raise RuntimeError(f"Platzi API error: Status {response.status_code}")
+    
+    payload = response.json()
+    if "errors" in payload:
+        raise RuntimeError(f"Platzi API returned errors: {payload['errors']}")
+    
+    _write_platzi_cache(path, {
+        "fetched_at": time.time(),
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "data": payload.get("data", {})
+    })
+    return payload.get("data", {})
+
+def iter_platzi_course_pages(page_size=PLATZI_PAGE_SIZE, max_courses=PLATZI_MAX_COURSES, revalidate=False):
+    """Yield the catalog one page of course edges at a time, following the pagination cursor"""
+    cursor = None
+    fetched = 0
+    while fetched < max_courses:
+        data = post_platzi_query(
+            PLATZI_COURSES_QUERY,
+            {"first": min(page_size, max_courses - fetched), "after": cursor},
+            revalidate=revalidate
         )
+        connection = data.get("allCourses") or {}
+        edges = connection.get("edges", [])
+        if edges:
+            fetched += len(edges)
+            yield edges
         
-        if response.status_code == 200:
-            data = response.json()
-            if "errors" in data:
-                st.error(f"Platzi API returned errors: {data['errors']}")
-                return []
-            return data.get("data", {}).get("allCourses", {}).get("edges", [])
-        else:
-            st.error(f"Platzi API error: Status {response.status_code}")
-            return []
-    except requests.exceptions.Timeout:
-        st.error("Request to Platzi API timed out")
-        return []
-    except Exception as e:
-        st.error(f"Error fetching Platzi courses: {e}")
-        return []
+        page_info = connection.get("pageInfo") or {}
+        if not edges or not page_info.get("hasNextPage") or not page_info.get("endCursor"):
+            return
+        cursor = page_info["endCursor"]
 
-def import_platzi_course_as_product(supabase, course_node, default_price=99.99):
-    """Import a Platzi course as a product in your dropshipping system"""
+@instrumented
+def fetch_platzi_courses(max_courses=PLATZI_MAX_COURSES, on_page=None, revalidate=False):
+    """
+    Fetch the whole course catalog from Platzi's free public GraphQL API.
+    
+    on_page(courses) is called with everything fetched so far after each
+    page, so the UI can show courses as they arrive. On failure the courses
+    fetched before it are returned.
+    """
+    courses = []
+    try:
+        for edges in iter_platzi_course_pages(max_courses=max_courses, revalidate=revalidate):
+            courses.extend(edges)
+            if on_page:
+                on_page(courses)
+    except requests.exceptions.Timeout:
+        _report_read_error("Request to Platzi API timed out")
+    except Exception as e:
+        _report_read_error(f"Error fetching Platzi courses: {e}")
+    return courses
+
+def platzi_sku(course_node):
+    """SKU a Platzi course is imported under"""
+    return f"PLATZI-{course_node.get('slug', 'unknown').upper()}"
+
+def _sku_index():
+    """Session index of SKU -> whether a product with it exists"""
+    key = ("products", "sku_index")
+    index = cache_get(key)
+    if index is None:
+        index = {}
+        cache_set(key, index)
+    return index
+
+def _remember_skus(skus, exists=True):
+    """Record known SKU existence in the session index"""
+    index = _sku_index()
+    for sku in skus:
+        index[sku] = exists
+
+def _lookup_existing_skus(supabase, skus):
+    """
+    Return the subset of skus that exist, querying only SKUs not yet in the index.
+    
+    Unknown SKUs are looked up PLATZI_IMPORT_BATCH_SIZE at a time, since each
+    lookup is a GET whose in_() list has to fit in the URL.
+    """
+    index = _sku_index()
+    unknown = list(dict.fromkeys(sku for sku in skus if sku not in index))
+    for start in range(0, len(unknown), PLATZI_IMPORT_BATCH_SIZE):
+        chunk = unknown[start:start + PLATZI_IMPORT_BATCH_SIZE]
+        response = supabase.table("products").select("sku").in_("sku", chunk).execute()
+        found = {row['sku'] for row in response.data}
+        for sku in chunk:
+            index[sku] = sku in found
+    return {sku for sku in skus if index[sku]}
+
+@instrumented
+def get_existing_skus(supabase, skus):
+    """Return which of the given SKUs already exist as products (batched queries, cached for the session)"""
+    try:
+        return _lookup_existing_skus(supabase, skus)
+    except Exception as e:
+        _report_read_error(f"❌ Error checking existing products: {e}")
+        return set()
+
+def build_platzi_product(course_node, default_price=99.99):
+    """Build the product row a Platzi course is imported as"""
     teacher = course_node.get("teacher", {})
     
-    product_data = {
+    return {
         "name": course_node.get("title", "Unknown Course"),
-        "sku": f"PLATZI-{course_node.get('slug', 'unknown').upper()}",
+        "sku": platzi_sku(course_node),
         "description": course_node.get("description", "No description available"),
         "price": default_price,
         "cost": 0.00,  # Digital product, no cost
@@ -194,51 +1484,1204 @@ def import_platzi_course_as_product(supabase, course_node, default_price=99.99):
         "supplier_url": f"https://platzi.com/courses/{course_node.get('slug', '')}",
         "category": "Online Courses"
     }
+
+@instrumented
+def import_platzi_course_as_product(supabase, course_node, default_price=99.99):
+    """Import a Platzi course as a product in your dropshipping system"""
+    product_data = build_platzi_product(course_node, default_price)
+    
+    # Skip courses the session already knows are imported, without a round trip
+    if _sku_index().get(product_data["sku"]):
+        return False, "❌ Product with this SKU already exists!", None
+    
+    success, message, product_id = add_product(supabase, product_data)
+    if success or "already exists" in message:
+        _remember_skus([product_data["sku"]])
+    return success, message, product_id
+
+@instrumented
+def bulk_import_platzi_courses(supabase, course_nodes, default_price=99.99, overwrite=False,
+                               batch_size=PLATZI_IMPORT_BATCH_SIZE, on_progress=None):
+    """
+    Import many Platzi courses using chunked multi-row upserts keyed on SKU.
+    
+    Each chunk costs at most one SKU lookup (none when the session SKU index
+    already covers it) and one upsert, instead of one insert per course.
+    Existing products are updated when overwrite is set and skipped
+    otherwise. Returns one result dict per course with its sku, name and
+    outcome ("inserted", "updated", "skipped" or "failed") plus a message.
+    """
+    results = []
+    products = {}
+    for node in course_nodes:
+        product = build_platzi_product(node, default_price)
+        result = {"sku": product["sku"], "name": product["name"], "outcome": None, "message": ""}
+        if product["sku"] in products:
+            result.update(outcome="skipped", message="Duplicate course in this import")
+        else:
+            products[product["sku"]] = product
+        results.append(result)
+    
+    outcomes = {}
+    skus = list(products)
+    for start in range(0, len(skus), batch_size):
+        chunk = skus[start:start + batch_size]
+        try:
+            existing = _lookup_existing_skus(supabase, chunk)
+            
+            rows = [products[sku] for sku in chunk if overwrite or sku not in existing]
+            if rows:
+                supabase.table("products").upsert(
+                    rows,
+                    on_conflict="sku",
+                    ignore_duplicates=not overwrite
+                ).execute()
+            
+            for sku in chunk:
+                if sku not in existing:
+                    outcomes[sku] = ("inserted", "")
+                elif overwrite:
+                    outcomes[sku] = ("updated", "")
+                else:
+                    outcomes[sku] = ("skipped", "Product with this SKU already exists")
+        except Exception as e:
+            for sku in chunk:
+                outcomes[sku] = ("failed", str(e))
+        
+        if on_progress:
+            on_progress(min(start + batch_size, len(skus)), len(skus))
     
-    return add_product(supabase, product_data)
+    for result in results:
+        if result["outcome"] is None:
+            result["outcome"], result["message"] = outcomes[result["sku"]]
+    
+    invalidate_cache("products", "orders")
+    _remember_skus([sku for sku, (outcome, _) in outcomes.items() if outcome != "failed"])
+    return results
 
 # ========================================
 # ORDER FUNCTIONS
 # ========================================
 
+@instrumented
 def add_order(supabase, order_data):
     """Add a new order to Supabase"""
     try:
         response = supabase.table("orders").insert(order_data).execute()
+        invalidate_cache("orders")
         return True, "✅ Order created successfully!", response.data[0]['id']
     except Exception as e:
         return False, f"❌ Error creating order: {e}", None
 
-def get_all_orders(supabase):
-    """Retrieve all orders with customer and product details"""
+@instrumented
+def place_order(supabase, customer_id, product_id, quantity, status="pending", tracking_number=None, notes=None):
+    """
+    Place an order through the place_order database function.
+    
+    In one transaction and one request it locks the product row, checks and
+    decrements its stock, and inserts the order priced from the current
+    product row, so concurrent sessions can never oversell.
+    """
     try:
-        response = supabase.table("orders").select(
+        response = supabase.rpc("place_order", {
+            "p_customer_id": customer_id,
+            "p_product_id": product_id,
+            "p_quantity": quantity,
+            "p_status": status,
+            "p_tracking_number": tracking_number,
+            "p_notes": notes
+        }).execute()
+        order = response.data[0] if isinstance(response.data, list) else response.data
+        invalidate_cache("orders", "products")  # Stock changed too
+        return True, f"✅ Order created successfully! Total: ${float(order['total_amount']):,.2f}", order['id']
+    except Exception as e:
+        error_msg = getattr(e, "message", None) or str(e)
+        if "insufficient stock" in error_msg.lower():
+            invalidate_cache("products")  # The stock shown in the form was stale
+            return False, f"❌ {error_msg}", None
+        return False, f"❌ Error creating order: {error_msg}", None
+
+@instrumented
+def place_order_group(supabase, customer_id, items, status="pending", notes=None):
+    """
+    Check out a multi-item cart through the place_order_group database function.
+    
+    items is a list of {"product_id", "quantity"} dicts. Every line is stock
+    checked, decremented and inserted in one transaction and one request,
+    whatever the basket size, and the lines share an order_groups parent.
+    Returns (success, message, orders).
+    """
+    try:
+        response = supabase.rpc("place_order_group", {
+            "p_customer_id": customer_id,
+            "p_items": [{"product_id": item["product_id"], "quantity": item["quantity"]} for item in items],
+            "p_status": status,
+            "p_notes": notes
+        }).execute()
+        orders = response.data or []
+        invalidate_cache("orders", "products")  # Stock changed too
+        total = sum(float(order['total_amount']) for order in orders)
+        return True, f"✅ {len(orders)} orders created successfully! Total: ${total:,.2f}", orders
+    except Exception as e:
+        error_msg = getattr(e, "message", None) or str(e)
+        if "insufficient stock" in error_msg.lower():
+            invalidate_cache("products")  # The stock shown in the cart was stale
+            return False, f"❌ {error_msg}", []
+        return False, f"❌ Error checking out: {error_msg}", []
+
+def order_filters(statuses=None, created_from=None, created_before=None):
+    """
+    Filters for orders in the given statuses created in [created_from, created_before).
+    
+    Dates or datetimes are accepted; None leaves that side of the range open.
+    Returns None when nothing is filtered.
+    """
+    filters = {}
+    if statuses is not None:
+        filters["status.in"] = tuple(statuses)
+    if created_from is not None:
+        filters["created_at.gte"] = created_from.isoformat()
+    if created_before is not None:
+        filters["created_at.lt"] = created_before.isoformat()
+    return filters or None
+
+
+@instrumented
+def get_all_orders(supabase, statuses=None, created_from=None, created_before=None):
+    """
+    Retrieve all orders with customer and product details (cached per session).
+    
+    statuses and the [created_from, created_before) range are applied in the
+    query, so narrow reads only download matching orders.
+    """
+    filters = order_filters(statuses, created_from, created_before)
+    if DATA_SYNC_MODE != "off":
+        orders = get_synced_orders(supabase)
+        return [order for order in orders if _row_matches(order, filters)] if filters else orders
+    
+    # Filtered reads get their own key so _patch_cached_rows drops them instead of patching
+    key = ("orders", "filtered", _filter_key(filters)) if filters else ("orders", "all")
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        query = supabase.table("orders").select(
             "*, customers(name, email, phone), products(name, sku, price)"
-        ).order("created_at", desc=True).execute()
+        )
+        response = _apply_filters(query, filters).order("created_at", desc=True).execute()
+        cache_set(key, response.data)
         return response.data
     except Exception as e:
-        st.error(f"❌ Error retrieving orders: {e}")
+        _report_read_error(f"❌ Error retrieving orders: {e}")
         return []
 
+def count_orders(supabase, statuses=None, created_from=None, created_before=None):
+    """Count the orders matching the filters without downloading them"""
+    return count_rows(supabase, "orders", order_filters(statuses, created_from, created_before))
+
+@instrumented
+def get_orders_page(supabase, page_size=PAGE_SIZE_OPTIONS[0], cursor=None, statuses=None,
+                    created_from=None, created_before=None):
+    """Retrieve one page of matching orders with customer and product details, newest first"""
+    filters = order_filters(statuses, created_from, created_before)
+    try:
+        return _fetch_page(
+            supabase,
+            "orders",
+            "*, customers(name, email, phone), products(name, sku, price)",
+            page_size,
+            cursor,
+            filters
+        )
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving orders: {e}")
+        return [], None
+
+@instrumented
 def update_order_status(supabase, order_id, status):
     """Update order status"""
     try:
         response = supabase.table("orders").update({"status": status}).eq("id", order_id).execute()
+        _patch_cached_rows("orders", [order_id], {"status": status})
         return True, f"✅ Order status updated to {status}!"
     except Exception as e:
         return False, f"❌ Error updating order: {e}"
 
-def delete_order(supabase, order_id):
-    """Delete an order"""
-    try:
-        supabase.table("orders").delete().eq("id", order_id).execute()
-        return True, "✅ Order deleted successfully!"
-    except Exception as e:
-        return False, f"❌ Error deleting order: {e}"
+@instrumented
+def delete_order(supabase, order_id):
+    """Delete an order"""
+    try:
+        supabase.table("orders").delete().eq("id", order_id).execute()
+        _drop_cached_rows("orders", [order_id])
+        return True, "✅ Order deleted successfully!"
+    except Exception as e:
+        return False, f"❌ Error deleting order: {e}"
+
+@instrumented
+def update_orders_status(supabase, order_ids, status):
+    """Update the status of many orders in a single request"""
+    try:
+        supabase.table("orders").update({"status": status}).in_("id", list(order_ids)).execute()
+        _patch_cached_rows("orders", order_ids, {"status": status})
+        return True, f"✅ {len(order_ids)} orders updated to {status}!"
+    except Exception as e:
+        return False, f"❌ Error updating orders: {e}"
+
+@instrumented
+def delete_orders(supabase, order_ids):
+    """Delete many orders in a single request"""
+    try:
+        supabase.table("orders").delete().in_("id", list(order_ids)).execute()
+        _drop_cached_rows("orders", order_ids)
+        return True, f"✅ {len(order_ids)} orders deleted successfully!"
+    except Exception as e:
+        return False, f"❌ Error deleting orders: {e}"
+
+# ========================================
+# EXPORT FUNCTIONS
+# ========================================
+
+def iter_table_chunks(supabase, table, columns="*", chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a whole table newest first, one keyset page at a time, bypassing the session cache"""
+    cursor = None
+    while True:
+        rows, cursor = _query_page(supabase, table, columns, chunk_size, cursor)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
+
+def _chunk_frame(rows):
+    """Flatten a chunk of rows, turning embedded customers/products into customers_name etc."""
+    return pd.json_normalize(rows, sep="_")
+
+class _CsvChunkWriter:
+    """Appends DataFrame chunks to a CSV file, header first"""
+    
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.columns = None
+    
+    def write(self, df):
+        # Later chunks are aligned to the first chunk's columns
+        header = self.columns is None
+        if header:
+            self.columns = list(df.columns)
+        df.reindex(columns=self.columns).to_csv(self.file, header=header, index=False)
+    
+    def close(self):
+        self.file.close()
+
+class _ParquetChunkWriter:
+    """Appends DataFrame chunks to a Parquet file as row groups (needs pyarrow)"""
+    
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        self.pa, self.pq = pa, pq
+        self.path = path
+        self.writer = None
+    
+    def write(self, df):
+        pa = self.pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            # Columns that are all NULL in the first chunk take their known type, or string
+            schema = pa.schema([
+                pa.field(f.name, pa.type_for_alias(EXPORT_COLUMN_TYPES.get(f.name, "string")))
+                if pa.types.is_null(f.type) else f
+                for f in table.schema
+            ])
+            self.writer = self.pq.ParquetWriter(self.path, schema)
+        
+        # Align later chunks to the file schema: missing columns become NULL, types are cast
+        schema = self.writer.schema
+        columns = [
+            table.column(name) if name in table.column_names else pa.nulls(table.num_rows, schema.field(name).type)
+            for name in schema.names
+        ]
+        self.writer.write_table(pa.Table.from_arrays(columns, names=schema.names).cast(schema))
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def read_export_file(path):
+    """Contents of a finished export, for the deferred download button"""
+    with open(path, "rb") as f:
+        return f.read()
+
+EXPORT_FORMATS = {"csv": _CsvChunkWriter, "parquet": _ParquetChunkWriter}
+
+def parquet_available():
+    """Whether the optional pyarrow dependency needed for Parquet exports is installed"""
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+@instrumented
+def export_table(supabase, table, path, fmt="csv", chunk_size=EXPORT_CHUNK_SIZE, on_progress=None):
+    """
+    Stream a table to a CSV or Parquet file chunk by chunk.
+    
+    Only one chunk is held in memory at a time, whatever the table size.
+    on_progress(rows_written) is called after each chunk.
+    """
+    rows_written = 0
+    try:
+        writer = EXPORT_FORMATS[fmt](path)
+    except ImportError:
+        return False, "❌ Parquet export needs pyarrow. Run: pip install pyarrow", 0
+    
+    try:
+        for rows in iter_table_chunks(supabase, table, EXPORT_COLUMNS[table], chunk_size):
+            writer.write(_chunk_frame(rows))
+            rows_written += len(rows)
+            if on_progress:
+                on_progress(rows_written)
+        writer.close()
+        return True, f"✅ Exported {rows_written:,} {table} to {path}", rows_written
+    except Exception as e:
+        writer.close()
+        if os.path.exists(path):
+            os.remove(path)  # Don't leave a truncated export behind
+        return False, f"❌ Error exporting {table}: {e}", rows_written
+
+# ========================================
+# FILE IMPORT FUNCTIONS
+# ========================================
+
+# Columns a customer or product file may contain, its required columns and its upsert key
+FILE_IMPORT_SCHEMAS = {
+    "customers": {
+        "columns": ["name", "email", "phone", "address", "city", "state", "zip_code", "country"],
+        "required": ["name", "email", "phone", "address"],
+        "key": "email"
+    },
+    "products": {
+        "columns": ["name", "sku", "description", "price", "cost", "stock_quantity", "supplier_name",
+                    "supplier_url", "category"],
+        "required": ["name", "sku", "price"],
+        "key": "sku"
+    }
+}
+
+def iter_file_chunks(file, fmt="csv", chunk_size=FILE_IMPORT_CHUNK_SIZE):
+    """Yield an uploaded CSV or Parquet file as DataFrames of string columns, chunk by chunk"""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas().astype("string").fillna("")
+    else:
+        yield from pd.read_csv(file, dtype=str, keep_default_na=False, chunksize=chunk_size)
+
+def _add_reason(reasons, mask, reason):
+    """Append reason to every row where mask is set"""
+    return reasons.mask(mask, reasons + reason + "; ")
+
+def validate_import_chunk(table, df):
+    """
+    Validate a chunk of a customer or product file with vectorized string operations.
+    
+    Applies the same rules as the Add Customer/Add Product forms. Returns
+    the clean rows as a DataFrame and a Series with the rejection reasons of
+    the rest.
+    """
+    schema = FILE_IMPORT_SCHEMAS[table]
+    df = df[[column for column in schema["columns"] if column in df.columns]].copy()
+    for column in df.columns:
+        df[column] = df[column].astype("string").fillna("").str.strip()
+    
+    reasons = pd.Series("", index=df.index, dtype="string")
+    for column in schema["required"]:
+        reasons = _add_reason(reasons, df[column] == "", f"Missing {column}")
+    
+    if table == "customers":
+        df["email"] = df["email"].str.lower()
+        reasons = _add_reason(reasons, (df["email"] != "") & ~valid_emails(df["email"]), "Invalid email")
+        reasons = _add_reason(reasons, (df["phone"] != "") & ~valid_phones(df["phone"]),
+                              "Invalid phone (10-15 digits)")
+    else:
+        df["sku"] = df["sku"].str.upper()
+        price = pd.to_numeric(df["price"], errors="coerce")
+        reasons = _add_reason(reasons, (df["price"] != "") & ~(price >= 0.01).fillna(False), "Invalid price")
+        df["price"] = price
+        if "cost" in df.columns:
+            cost = pd.to_numeric(df["cost"].where(df["cost"] != ""), errors="coerce")
+            reasons = _add_reason(reasons, (df["cost"] != "") & ~(cost >= 0).fillna(False), "Invalid cost")
+            df["cost"] = cost
+        if "stock_quantity" in df.columns:
+            stock = pd.to_numeric(df["stock_quantity"].replace("", "0"), errors="coerce")
+            reasons = _add_reason(reasons, ~((stock >= 0) & (stock % 1 == 0)).fillna(False),
+                                  "Invalid stock quantity")
+            df["stock_quantity"] = stock
+    
+    reasons = reasons.str.rstrip("; ")
+    return df[reasons == ""], reasons[reasons != ""]
+
+def _import_records(df):
+    """Turn validated rows into JSON-ready dicts (NaN becomes None, stock an int)"""
+    df = df.astype(object).where(df.notna(), None)
+    if "stock_quantity" in df.columns:
+        df["stock_quantity"] = df["stock_quantity"].map(lambda value: int(value) if value is not None else 0)
+    return df.to_dict("records")
+
+@instrumented
+def import_file(supabase, table, file, fmt="csv", chunk_size=FILE_IMPORT_CHUNK_SIZE,
+                batch_size=FILE_IMPORT_BATCH_SIZE, on_progress=None):
+    """
+    Import a customer or product file with batched upserts keyed on email/SKU.
+    
+    The file is read and validated chunk by chunk; valid rows are upserted
+    batch_size at a time, so existing customers/products are updated in
+    place. Returns (success, message, rejected) where rejected is a
+    DataFrame of the rejected rows (with their file row number and reason).
+    on_progress(rows_read, rows_imported) is called after each chunk.
+    """
+    schema = FILE_IMPORT_SCHEMAS[table]
+    key = schema["key"]
+    seen_keys = set()
+    imported_keys = []
+    rejected = []
+    rows_read = imported = 0
+    
+    try:
+        for df in iter_file_chunks(file, fmt, chunk_size):
+            missing = [column for column in schema["required"] if column not in df.columns]
+            if missing:
+                return False, f"❌ The file is missing required columns: {', '.join(missing)}", pd.DataFrame()
+            
+            df.index = pd.RangeIndex(rows_read + 2, rows_read + 2 + len(df))  # File line numbers (after the header)
+            rows_read += len(df)
+            valid, reasons = validate_import_chunk(table, df)
+            
+            # The first occurrence of an email/SKU wins; later ones in the file are rejected
+            duplicate = valid[key].duplicated() | valid[key].isin(seen_keys)
+            reasons = pd.concat([reasons, pd.Series(f"Duplicate {key} in file", index=valid.index[duplicate])])
+            valid = valid[~duplicate]
+            seen_keys.update(valid[key])
+            
+            if len(reasons):
+                report = df.loc[reasons.index].copy()
+                report.insert(0, "row", report.index)
+                report["reason"] = reasons
+                rejected.append(report)
+            
+            records = _import_records(valid)
+            for start in range(0, len(records), batch_size):
+                batch = records[start:start + batch_size]
+                try:
+                    supabase.table(table).upsert(batch, on_conflict=key).execute()
+                    imported += len(batch)
+                    imported_keys += [record[key] for record in batch]
+                except Exception as e:
+                    failed = pd.DataFrame(batch)
+                    failed.insert(0, "row", valid.index[start:start + batch_size])
+                    failed["reason"] = f"Upsert failed: {e}"
+                    rejected.append(failed)
+            
+            if on_progress:
+                on_progress(rows_read, imported)
+    except Exception as e:
+        return False, f"❌ Error reading file: {e}", pd.concat(rejected) if rejected else pd.DataFrame()
+    finally:
+        if imported:
+            invalidate_cache(table, "orders")  # Orders embed customer/product fields
+            if table == "products":
+                _remember_skus(imported_keys)
+    
+    rejected = pd.concat(rejected).sort_values("row") if rejected else pd.DataFrame()
+    message = f"✅ Imported {imported:,} of {rows_read:,} {table}"
+    if len(rejected):
+        message += f" ({len(rejected):,} rejected)"
+    return True, message, rejected
+
+# ========================================
+# DASHBOARD FUNCTIONS
+# ========================================
+
+@instrumented
+def count_rows(supabase, table, filters=None):
+    """Count rows in a table (optionally only those matching filters) without downloading them"""
+    if DATA_SYNC_MODE != "off":
+        return count_synced_rows(supabase, table, filters)
+    
+    key = (table, "count", _filter_key(filters))
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        query = _apply_filters(supabase.table(table).select("id", count="exact"), filters)
+        response = query.limit(1).execute()
+        cache_set(key, response.count or 0)
+        return response.count or 0
+    except Exception as e:
+        _report_read_error(f"❌ Error counting {table}: {e}")
+        return 0
+
+@instrumented
+def get_order_totals(supabase):
+    """Retrieve total order count and revenue from the order_totals view"""
+    if DATA_SYNC_MODE != "off":
+        orders_df = get_synced_orders_frame(supabase)
+        return {"order_count": len(orders_df), "total_revenue": order_revenue_total(orders_df)}
+    
+    key = ("orders", "totals")
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("order_totals").select("order_count, total_revenue").execute()
+        totals = response.data[0] if response.data else {"order_count": 0, "total_revenue": 0}
+        cache_set(key, totals)
+        return totals
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving order totals: {e}")
+        return {"order_count": 0, "total_revenue": 0}
+
+@instrumented
+def get_order_status_summary(supabase):
+    """Retrieve order count and revenue per status from the order_status_summary view"""
+    key = ("orders", "status_summary")
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("order_status_summary").select("status, order_count, revenue").execute()
+        cache_set(key, response.data)
+        return response.data
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving order status summary: {e}")
+        return []
+
+@instrumented
+def get_top_products(supabase, limit=DASHBOARD_TOP_N):
+    """Retrieve the best selling products by revenue via the top_products_by_revenue function"""
+    key = ("orders", "top_products", limit)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.rpc("top_products_by_revenue", {"limit_count": limit}).execute()
+        cache_set(key, response.data)
+        return response.data
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving top products: {e}")
+        return []
+
+@instrumented
+def get_recent_orders(supabase, limit=DASHBOARD_TOP_N):
+    """Retrieve the most recent orders with customer and product details"""
+    key = ("orders", "recent", limit)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("orders").select(
+            "*, customers(name, email, phone), products(name, sku, price)"
+        ).order("created_at", desc=True).limit(limit).execute()
+        cache_set(key, response.data)
+        return response.data
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving recent orders: {e}")
+        return []
+
+@instrumented
+def get_inventory_valuation(supabase):
+    """Retrieve product count, units in stock and stock value from the inventory_valuation view"""
+    if DATA_SYNC_MODE != "off":
+        return inventory_valuation(get_synced_rows(supabase, "products"))
+    
+    key = ("products", "valuation")
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("inventory_valuation").select(
+            "product_count, units_in_stock, inventory_value"
+        ).execute()
+        valuation = response.data[0] if response.data else {"product_count": 0, "units_in_stock": 0, "inventory_value": 0}
+        cache_set(key, valuation)
+        return valuation
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving inventory value: {e}")
+        return {"product_count": 0, "units_in_stock": 0, "inventory_value": 0}
+
+def low_stock_threshold(category):
+    """Alert threshold for a category (None means its products never alert)"""
+    return LOW_STOCK_CATEGORY_THRESHOLDS.get(category, LOW_STOCK_THRESHOLD)
+
+def _low_stock_filter():
+    """
+    PostgREST or_() expression matching products at or below their category's threshold.
+    
+    Each overridden category gets its own clause; every other category
+    (including uncategorized products) falls back to LOW_STOCK_THRESHOLD.
+    """
+    overridden = ",".join(_quote_value(category) for category in LOW_STOCK_CATEGORY_THRESHOLDS)
+    clauses = [
+        f"and(category.eq.{_quote_value(category)},stock_quantity.lte.{threshold})"
+        for category, threshold in LOW_STOCK_CATEGORY_THRESHOLDS.items()
+        if threshold is not None
+    ]
+    clauses.append(
+        f"and(or(category.is.null,category.not.in.({overridden})),stock_quantity.lte.{LOW_STOCK_THRESHOLD})"
+    )
+    return ",".join(clauses)
+
+@instrumented
+def get_low_stock_products(supabase, limit=LOW_STOCK_ALERT_LIMIT):
+    """Retrieve the lowest-stocked products under their alert threshold, plus how many there are in total"""
+    if DATA_SYNC_MODE != "off":
+        low_stock, total = find_low_stock_products(get_synced_rows(supabase, "products"), limit)
+        return _project(low_stock, PRODUCT_COLUMNS["alerts"]), total
+    
+    key = ("products", "low_stock", limit)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        query = supabase.table("products").select(PRODUCT_COLUMNS["alerts"], count="exact")
+        if LOW_STOCK_CATEGORY_THRESHOLDS:
+            query = query.or_(_low_stock_filter())
+        else:
+            query = query.lte("stock_quantity", LOW_STOCK_THRESHOLD)
+        response = query.order("stock_quantity").order("id").limit(limit).execute()
+        result = (response.data, response.count or len(response.data))
+        cache_set(key, result)
+        return result
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving low stock products: {e}")
+        return [], 0
+
+@instrumented
+def get_daily_sales_trend(supabase, since):
+    """Retrieve order count, units and revenue per day from the daily_sales rollup, starting at since"""
+    if DATA_SYNC_MODE != "off":
+        return daily_sales_trend(get_synced_orders_frame(supabase), since)
+    
+    key = ("orders", "daily_sales", since.isoformat())
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = supabase.table("daily_sales_trend").select(
+            "day, order_count, quantity, revenue"
+        ).gte("day", since.isoformat()).order("day").execute()
+        cache_set(key, response.data)
+        return response.data
+    except Exception as e:
+        _report_read_error(f"❌ Error retrieving daily sales: {e}")
+        return []
+
+def get_dashboard_metrics(supabase):
+    """Collect every dashboard metric from database-side aggregates (or the local copies when syncing)"""
+    if DATA_SYNC_MODE != "off":
+        customers = get_synced_rows(supabase, "customers")
+        products = get_synced_rows(supabase, "products")
+        orders = get_synced_orders(supabase)
+        return _memoize("dashboard", [customers, products, orders],
+                        lambda: compute_dashboard_metrics(customers, products, orders))
+    
+    totals = get_order_totals(supabase)
+    return {
+        "total_customers": count_rows(supabase, "customers"),
+        "total_products": count_rows(supabase, "products"),
+        "total_orders": totals["order_count"],
+        "total_revenue": totals["total_revenue"],
+        "status_summary": get_order_status_summary(supabase),
+        "top_products": get_top_products(supabase),
+        "recent_orders": get_recent_orders(supabase)
+    }
+
+# ========================================
+# REPORTING REPLICA
+# ========================================
+
+REPLICA_COLUMNS = {
+    "customers": ["id", "name", "email", "phone", "address", "city", "state", "zip_code", "country",
+                  "created_at", "updated_at"],
+    "products": ["id", "name", "sku", "description", "price", "cost", "stock_quantity", "supplier_name",
+                 "supplier_url", "category", "created_at", "updated_at"],
+    "orders": ["id", "customer_id", "product_id", "quantity", "total_amount", "status", "tracking_number",
+               "notes", "created_at", "updated_at"]
+}
+
+REPLICA_DDL = """
+CREATE TABLE IF NOT EXISTS customers (
+    id INTEGER PRIMARY KEY, name TEXT, email TEXT, phone TEXT, address TEXT, city TEXT,
+    state TEXT, zip_code TEXT, country TEXT, created_at TEXT, updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY, name TEXT, sku TEXT, description TEXT, price REAL, cost REAL,
+    stock_quantity INTEGER, supplier_name TEXT, supplier_url TEXT, category TEXT,
+    created_at TEXT, updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY, customer_id INTEGER, product_id INTEGER, quantity INTEGER,
+    total_amount REAL, status TEXT, tracking_number TEXT, notes TEXT, created_at TEXT, updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS replica_state (
+    table_name TEXT PRIMARY KEY, watermark TEXT, reconciled_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+CREATE INDEX IF NOT EXISTS idx_orders_product ON orders(product_id);
+CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_id);
+CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_products_stock ON products(stock_quantity);
+"""
+
+@st.cache_resource
+def _replica_state():
+    """Process-wide refresh bookkeeping for the replica file"""
+    return {"lock": threading.Lock(), "last_refresh": 0.0, "stale": True, "reconcile": False, "schemas": set()}
+
+def _replica_connect(timeout=30):
+    """Open the replica, creating its schema the first time this process opens the file"""
+    conn = sqlite3.connect(REPLICA_PATH, timeout=timeout)
+    conn.row_factory = sqlite3.Row
+    schemas = _replica_state()["schemas"]
+    if REPLICA_PATH not in schemas:
+        conn.executescript(REPLICA_DDL)
+        schemas.add(REPLICA_PATH)
+    return conn
+
+def _refresh_replica_table(supabase, conn, table, reconcile=False):
+    """Upsert rows changed since the table's stored watermark; reconcile deletes when due (or asked to)"""
+    columns = REPLICA_COLUMNS[table]
+    state = conn.execute(
+        "SELECT watermark, reconciled_at FROM replica_state WHERE table_name = ?", (table,)
+    ).fetchone()
+    watermark, reconciled_at = (state["watermark"], state["reconciled_at"]) if state else (None, 0.0)
+    
+    upsert_sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columns[1:])}"
+    )
+    for batch in iter_changed_rows(supabase, table, watermark):
+        conn.executemany(upsert_sql, [tuple(row.get(c) for c in columns) for row in batch])
+        watermark = batch[-1]['updated_at']
+        conn.execute(
+            "INSERT OR REPLACE INTO replica_state (table_name, watermark, reconciled_at) VALUES (?, ?, ?)",
+            (table, watermark, reconciled_at)
+        )
+        conn.commit()
+    
+    if reconcile or time.time() - reconciled_at >= SYNC_RECONCILE_SECONDS:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_ids (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM live_ids")
+        conn.executemany("INSERT INTO live_ids (id) VALUES (?)", [(row_id,) for row_id in fetch_live_ids(supabase, table)])
+        conn.execute(f"DELETE FROM {table} WHERE id NOT IN (SELECT id FROM live_ids)")
+        conn.execute(
+            "INSERT OR REPLACE INTO replica_state (table_name, watermark, reconciled_at) VALUES (?, ?, ?)",
+            (table, watermark, time.time())
+        )
+        conn.commit()
+
+@instrumented
+def refresh_replica(supabase, force=False):
+    """
+    Bring the local SQLite replica up to date with Supabase.
+    
+    Watermarks live in the replica file itself, so even the first refresh
+    after a restart only pulls rows changed since the last run.
+    """
+    state = _replica_state()
+    with state["lock"]:
+        now = time.monotonic()
+        if not (force or state["stale"]) and now - state["last_refresh"] < REPLICA_REFRESH_SECONDS:
+            return
+        with closing(_replica_connect()) as conn:
+            for table in REPLICA_COLUMNS:
+                _refresh_replica_table(supabase, conn, table, reconcile=state["reconcile"])
+        state["last_refresh"] = now
+        state["stale"] = False
+        state["reconcile"] = False
+
+def replica_forget(table, row_ids):
+    """
+    Delete rows removed by this process (and their cascaded orders) from the replica.
+    
+    The Supabase delete has already succeeded, so a busy or broken replica
+    file must not fail it: the replica is instead flagged for a reconcile
+    pass on its next refresh, which drops the rows then.
+    """
+    placeholders = ", ".join("?" * len(row_ids))
+    try:
+        with closing(_replica_connect(timeout=1)) as conn:
+            conn.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", list(row_ids))
+            if table in SYNC_CASCADES:
+                child_table, foreign_key = SYNC_CASCADES[table]
+                conn.execute(f"DELETE FROM {child_table} WHERE {foreign_key} IN ({placeholders})", list(row_ids))
+            conn.commit()
+    except sqlite3.Error:
+        state = _replica_state()
+        state["stale"] = True
+        state["reconcile"] = True
+
+@instrumented
+def query_replica(supabase, sql, params=()):
+    """Run a read-only SQL query against the freshly refreshed replica"""
+    try:
+        refresh_replica(supabase)
+    except Exception as e:
+        # Report from the last good copy rather than failing the page
+        _report_read_error(f"❌ Error refreshing reporting replica: {e}")
+    with closing(_replica_connect()) as conn:
+        return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+def get_replica_order_totals(supabase):
+    """Total order count and revenue from the replica"""
+    return query_replica(
+        supabase,
+        "SELECT COUNT(*) AS order_count, COALESCE(SUM(total_amount), 0) AS total_revenue FROM orders"
+    )[0]
+
+def get_replica_inventory_valuation(supabase):
+    """Product count, units in stock and stock value from the replica"""
+    return query_replica(supabase, """
+        SELECT COUNT(*) AS product_count,
+               COALESCE(SUM(stock_quantity), 0) AS units_in_stock,
+               COALESCE(SUM(price * stock_quantity), 0) AS inventory_value
+        FROM products
+    """)[0]
+
+def get_replica_low_stock_products(supabase, limit=LOW_STOCK_ALERT_LIMIT):
+    """Lowest-stocked products under their alert threshold from the replica, plus the total count"""
+    # A NULL threshold (category set to None) never matches
+    threshold_sql = "?"
+    params = [LOW_STOCK_THRESHOLD]
+    if LOW_STOCK_CATEGORY_THRESHOLDS:
+        threshold_sql = "CASE " + "WHEN category = ? THEN ? " * len(LOW_STOCK_CATEGORY_THRESHOLDS) + "ELSE ? END"
+        params = [value for item in LOW_STOCK_CATEGORY_THRESHOLDS.items() for value in item] + params
+    
+    rows = query_replica(supabase, f"""
+        SELECT id, name, sku, stock_quantity, category, COUNT(*) OVER () AS total
+        FROM products
+        WHERE stock_quantity <= {threshold_sql}
+        ORDER BY stock_quantity, id
+        LIMIT ?
+    """, (*params, limit))
+    total = rows[0]["total"] if rows else 0
+    return [{k: v for k, v in row.items() if k != "total"} for row in rows], total
+
+def get_replica_daily_sales_trend(supabase, since):
+    """Order count, units and revenue per day from the replica, starting at since"""
+    return query_replica(supabase, """
+        SELECT substr(created_at, 1, 10) AS day, COUNT(*) AS order_count,
+               COALESCE(SUM(quantity), 0) AS quantity, COALESCE(SUM(total_amount), 0) AS revenue
+        FROM orders
+        WHERE created_at >= ?
+        GROUP BY day
+        ORDER BY day
+    """, (since.isoformat(),))
+
+def get_replica_dashboard_metrics(supabase, top_n=DASHBOARD_TOP_N):
+    """Collect every dashboard metric with SQL against the replica"""
+    totals = get_replica_order_totals(supabase)
+    recent_orders = query_replica(supabase, """
+        SELECT o.*, c.name AS customer_name, c.email AS customer_email, c.phone AS customer_phone,
+               p.name AS product_name, p.sku AS product_sku, p.price AS product_price
+        FROM orders o
+        LEFT JOIN customers c ON c.id = o.customer_id
+        LEFT JOIN products p ON p.id = o.product_id
+        ORDER BY o.created_at DESC, o.id DESC
+        LIMIT ?
+    """, (top_n,))
+    
+    return {
+        "total_customers": query_replica(supabase, "SELECT COUNT(*) AS n FROM customers")[0]["n"],
+        "total_products": query_replica(supabase, "SELECT COUNT(*) AS n FROM products")[0]["n"],
+        "total_orders": totals["order_count"],
+        "total_revenue": totals["total_revenue"],
+        "status_summary": query_replica(supabase, """
+            SELECT status, COUNT(*) AS order_count, COALESCE(SUM(total_amount), 0) AS revenue
+            FROM orders
+            GROUP BY status
+        """),
+        "top_products": query_replica(supabase, """
+            SELECT o.product_id, p.name, SUM(o.quantity) AS quantity, SUM(o.total_amount) AS revenue
+            FROM orders o
+            LEFT JOIN products p ON p.id = o.product_id
+            GROUP BY o.product_id
+            ORDER BY revenue DESC
+            LIMIT ?
+        """, (top_n,)),
+        "recent_orders": [
+            {
+                **{k: v for k, v in order.items() if not k.startswith(("customer_", "product_"))},
+                "customer_id": order["customer_id"],
+                "product_id": order["product_id"],
+                "customers": {"name": order["customer_name"], "email": order["customer_email"], "phone": order["customer_phone"]},
+                "products": {"name": order["product_name"], "sku": order["product_sku"], "price": order["product_price"]}
+            }
+            for order in recent_orders
+        ]
+    }
+
+# ========================================
+# ANALYTICS FUNCTIONS
+# ========================================
+
+ORDER_FRAME_COLUMNS = ["id", "product_id", "quantity", "total_amount", "status", "created_at"]
+
+def build_orders_frame(orders):
+    """Build a typed DataFrame from the orders payload (row positions match the list)"""
+    df = pd.DataFrame(orders, columns=ORDER_FRAME_COLUMNS)
+    df["product_id"] = pd.to_numeric(df["product_id"], errors="coerce").astype("Int64")
+    df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce").fillna(0).astype("int64")
+    df["total_amount"] = pd.to_numeric(df["total_amount"], errors="coerce").fillna(0.0).astype("float64")
+    df["status"] = df["status"].astype("string")
+    df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce", format="ISO8601")
+    return df
+
+def order_revenue_total(orders_df):
+    """Total revenue across all orders"""
+    return float(orders_df["total_amount"].sum())
+
+def order_status_breakdown(orders_df):
+    """Order count and revenue per status, in order of first appearance"""
+    summary = orders_df.groupby("status", sort=False).agg(
+        order_count=("total_amount", "size"),
+        revenue=("total_amount", "sum")
+    )
+    return [
+        {"status": status, "order_count": int(row.order_count), "revenue": float(row.revenue)}
+        for status, row in summary.iterrows()
+    ]
+
+def top_products_by_revenue(orders_df, products, n=DASHBOARD_TOP_N):
+    """Best selling products by revenue, with names looked up from products"""
+    sales = orders_df.groupby("product_id").agg(
+        quantity=("quantity", "sum"),
+        revenue=("total_amount", "sum")
+    ).nlargest(n, "revenue")
+    
+    product_names = {p['id']: p['name'] for p in products}
+    return [
+        {
+            "product_id": int(product_id),
+            "name": product_names.get(int(product_id)),
+            "quantity": int(row.quantity),
+            "revenue": float(row.revenue)
+        }
+        for product_id, row in sales.iterrows()
+    ]
+
+def most_recent_orders(orders_df, orders, n=DASHBOARD_TOP_N):
+    """The n newest orders from the original payload (keeps embedded customer/product)"""
+    positions = orders_df["created_at"].nlargest(n).index
+    return [orders[position] for position in positions]
+
+def inventory_valuation(products):
+    """Product count, units in stock and stock value of a product list"""
+    df = pd.DataFrame(products, columns=["price", "stock_quantity"])
+    stock = pd.to_numeric(df["stock_quantity"], errors="coerce").fillna(0)
+    price = pd.to_numeric(df["price"], errors="coerce").fillna(0)
+    return {
+        "product_count": len(df),
+        "units_in_stock": int(stock.sum()),
+        "inventory_value": float((price * stock).sum())
+    }
+
+def find_low_stock_products(products, limit=LOW_STOCK_ALERT_LIMIT):
+    """Lowest-stocked products under their alert threshold, plus the total count"""
+    low = []
+    for product in products:
+        threshold = low_stock_threshold(product.get('category'))
+        if threshold is not None and product.get('stock_quantity', 0) <= threshold:
+            low.append(product)
+    low.sort(key=lambda product: (product.get('stock_quantity', 0), product['id']))
+    return low[:limit], len(low)
+
+def daily_sales_trend(orders_df, since):
+    """Order count, units and revenue per day, starting at since"""
+    recent = orders_df[orders_df["created_at"] >= pd.Timestamp(since)]
+    trend = recent.groupby(recent["created_at"].dt.date).agg(
+        order_count=("total_amount", "size"),
+        quantity=("quantity", "sum"),
+        revenue=("total_amount", "sum")
+    )
+    return [
+        {"day": day.isoformat(), "order_count": int(row.order_count),
+         "quantity": int(row.quantity), "revenue": float(row.revenue)}
+        for day, row in trend.iterrows()
+    ]
+
+def sales_trend_frame(trend, since, until):
+    """Daily trend rows as a DataFrame with one row per day, days without orders filled with zeros"""
+    df = pd.DataFrame(trend, columns=["day", "order_count", "quantity", "revenue"])
+    df["day"] = pd.to_datetime(df["day"])
+    df[["order_count", "quantity", "revenue"]] = df[["order_count", "quantity", "revenue"]].apply(
+        pd.to_numeric, errors="coerce"
+    )
+    days = pd.date_range(since, until, freq="D", name="day")
+    return df.groupby("day").sum().reindex(days, fill_value=0).reset_index()
+
+def compute_dashboard_metrics(customers, products, orders, top_n=DASHBOARD_TOP_N):
+    """Compute the dashboard metrics client-side from full table reads"""
+    orders_df = build_orders_frame(orders)
+    
+    return {
+        "total_customers": len(customers),
+        "total_products": len(products),
+        "total_orders": len(orders_df),
+        "total_revenue": order_revenue_total(orders_df),
+        "status_summary": order_status_breakdown(orders_df),
+        "top_products": top_products_by_revenue(orders_df, products, top_n),
+        "recent_orders": most_recent_orders(orders_df, orders, top_n)
+    }
+
+# ========================================
+# STREAMLIT UI
+# ========================================
+
+def get_page_cursor(state_key):
+    """Return the cursor of the page currently shown in a paginated list"""
+    return st.session_state.setdefault(f"{state_key}_cursors", [None])[-1]
+
+def reset_pagination(state_key):
+    """Jump a paginated list back to its first page"""
+    st.session_state[f"{state_key}_cursors"] = [None]
+
+def table_key(state_key):
+    """Widget key of a selectable table, changed by clear_table_selection"""
+    return f"{state_key}_table_{st.session_state.get(f'{state_key}_table_version', 0)}"
+
+def clear_table_selection(state_key):
+    """
+    Drop a selectable table's selection.
+    
+    Selections are kept by row position across reruns, so after a delete
+    they would point at whichever rows moved into those positions. A new
+    widget key starts the table (and the browser's copy of it) unselected.
+    """
+    st.session_state.pop(table_key(state_key), None)
+    st.session_state[f"{state_key}_table_version"] = st.session_state.get(f"{state_key}_table_version", 0) + 1
+
+def selected_row(event, rows):
+    """Return the row picked in a selectable dataframe, or None"""
+    positions = event.selection.rows
+    if positions and positions[0] < len(rows):
+        return rows[positions[0]]
+    return None
+
+def selected_rows(event, rows):
+    """Return every row picked in a multi-row selectable dataframe"""
+    return [rows[position] for position in event.selection.rows if position < len(rows)]
+
+def render_performance_panel():
+    """Sidebar panel with per-page latency histograms of the instrumented calls and exports"""
+    with st.sidebar.expander("⏱ Performance"):
+        metrics = get_call_metrics()
+        if not metrics:
+            st.caption("No calls recorded yet.")
+            return
+        
+        page = st.selectbox("Page", sorted({m["page"] for m in metrics}), key="perf_page")
+        page_metrics = [m for m in metrics if m["page"] == page]
+        
+        labels = [f"≤{bound} ms" for bound in INSTRUMENTATION_BUCKETS_MS] + [f">{INSTRUMENTATION_BUCKETS_MS[-1]} ms"]
+        counts = [sum(m["buckets"][i] for m in page_metrics) for i in range(len(labels))]
+        fig = px.bar(x=labels, y=counts, labels={"x": "Latency", "y": "Calls"})
+        fig.update_layout(height=220, margin=dict(l=0, r=0, t=10, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.dataframe(pd.DataFrame([{
+            "Function": m["function"],
+            "Calls": m["calls"],
+            "Errors": m["errors"],
+            "Mean ms": round(m["total_ms"] / m["calls"], 1),
+            "Max ms": round(m["max_ms"], 1),
+            "Rows": m["rows"],
+            "KB": round(m["bytes"] / 1024, 1)
+        } for m in page_metrics]), use_container_width=True, hide_index=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("JSON", export_metrics_json(), file_name="dropshipping_metrics.json",
+                               mime="application/json", use_container_width=True)
+        with col2:
+            st.download_button("Prometheus", export_metrics_prometheus(), file_name="dropshipping_metrics.prom",
+                               mime="text/plain", use_container_width=True)
+        if st.button("🔄 Reset", key="perf_reset", use_container_width=True):
+            reset_call_metrics()
+            st.rerun()
+
+def render_file_import(supabase, table):
+    """Upload form for a customer/product CSV or Parquet file, with a downloadable report of rejected rows"""
+    schema = FILE_IMPORT_SCHEMAS[table]
+    st.markdown(
+        f"Columns: {', '.join(f'`{c}`' for c in schema['columns'])} "
+        f"(required: {', '.join(schema['required'])}). Rows whose `{schema['key']}` already exists are updated."
+    )
+    
+    uploaded = st.file_uploader(f"{table.title()} file", type=["csv", "parquet"], key=f"{table}_import_file")
+    if uploaded and st.button("📥 Import File", key=f"{table}_import", type="primary", use_container_width=True):
+        fmt = "parquet" if uploaded.name.lower().endswith(".parquet") else "csv"
+        progress = st.empty()
+        success, message, rejected = import_file(
+            supabase, table, uploaded, fmt,
+            on_progress=lambda read, imported: progress.info(f"📥 {read:,} rows read, {imported:,} imported...")
+        )
+        progress.empty()
+        st.session_state[f"{table}_import_result"] = (success, message, rejected)
+    
+    result = st.session_state.get(f"{table}_import_result")
+    if result:
+        success, message, rejected = result
+        if success:
+            st.success(message)
+        else:
+            st.error(message)
+        
+        if len(rejected):
+            st.dataframe(rejected.head(100), use_container_width=True, hide_index=True)
+            st.download_button(
+                "💾 Download rejected rows",
+                rejected.to_csv(index=False),
+                file_name=f"{table}_import_rejected.csv",
+                mime="text/csv",
+                key=f"{table}_import_report"
+            )
+
+def leave_empty_page(state_key, rows):
+    """Step back from a page past the first that came back empty (e.g. its last rows were deleted)"""
+    cursors = st.session_state.setdefault(f"{state_key}_cursors", [None])
+    if not rows and len(cursors) > 1:
+        cursors.pop()
+        st.rerun()
 
-# ========================================
-# STREAMLIT UI
-# ========================================
+def render_page_controls(state_key, next_cursor):
+    """Render previous/next navigation for a paginated list"""
+    cursors = st.session_state.setdefault(f"{state_key}_cursors", [None])
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col1:
+        if st.button("⬅️ Previous", key=f"{state_key}_prev", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    
+    with col2:
+        st.markdown(f"<div style='text-align: center'>Page {len(cursors)}</div>", unsafe_allow_html=True)
+    
+    with col3:
+        if st.button("Next ➡️", key=f"{state_key}_next", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
 
 def main():
     st.set_page_config(
@@ -268,9 +2711,11 @@ def main():
                 "👥 Customers",
                 "📦 Products",
                 "🛒 Orders",
-                "📊 Dashboard"
+                "📊 Dashboard",
+                "📤 Export"
             ]
         )
+    set_instrumented_page(page.split(" ", 1)[1])
     
     # ========================================
     # PAGE: SETUP INSTRUCTIONS
@@ -282,7 +2727,9 @@ def main():
         st.markdown("---")
         
         st.subheader("📦 Step 1: Install Required Packages")
-        st.code("""pip install streamlit supabase pandas""", language="bash")
+        st.code("""pip install -r requirements.txt
+# or: pip install streamlit supabase httpx pandas requests plotly pyarrow""", language="bash")
+        st.caption("pyarrow is only needed for Parquet exports")
         
         st.markdown("---")
         
@@ -356,9 +2803,249 @@ CREATE INDEX idx_products_sku ON products(sku);
 CREATE INDEX idx_orders_customer ON orders(customer_id);
 CREATE INDEX idx_orders_product ON orders(product_id);
 CREATE INDEX idx_orders_status ON orders(status);
+
+-- Keep updated_at current on every UPDATE (delta sync reads rows changed since a watermark)
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER customers_set_updated_at BEFORE UPDATE ON customers
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+CREATE TRIGGER products_set_updated_at BEFORE UPDATE ON products
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+CREATE TRIGGER orders_set_updated_at BEFORE UPDATE ON orders
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+CREATE INDEX idx_customers_updated ON customers(updated_at, id);
+CREATE INDEX idx_products_updated ON products(updated_at, id);
+CREATE INDEX idx_orders_updated ON orders(updated_at, id);
+
+-- Realtime change events (only needed for DATA_SYNC_MODE = "realtime")
+ALTER PUBLICATION supabase_realtime ADD TABLE customers, products, orders;
+
+-- Customer search: trigram indexes serve ILIKE '%term%' lookups
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_customers_name_trgm ON customers USING gin (name gin_trgm_ops);
+CREATE INDEX idx_customers_email_trgm ON customers USING gin (email gin_trgm_ops);
+
+-- Product picker: name/SKU prefix search
+CREATE INDEX idx_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX idx_products_sku_trgm ON products USING gin (sku gin_trgm_ops);
+
+-- Keyset pagination and recent activity: newest-first scans
+CREATE INDEX idx_customers_created ON customers(created_at DESC, id DESC);
+CREATE INDEX idx_products_created ON products(created_at DESC, id DESC);
+CREATE INDEX idx_orders_created ON orders(created_at DESC, id DESC);
+
+-- Orders filtered by status and created_at range, newest first
+CREATE INDEX idx_orders_status_created ON orders(status, created_at DESC, id DESC);
+
+-- Dashboard aggregates (computed in the database)
+CREATE OR REPLACE VIEW order_totals AS
+SELECT COUNT(*) AS order_count, COALESCE(SUM(total_amount), 0) AS total_revenue
+FROM orders;
+
+CREATE OR REPLACE VIEW order_status_summary AS
+SELECT status, COUNT(*) AS order_count, COALESCE(SUM(total_amount), 0) AS revenue
+FROM orders
+GROUP BY status;
+
+CREATE OR REPLACE VIEW inventory_valuation AS
+SELECT COUNT(*) AS product_count,
+       COALESCE(SUM(stock_quantity), 0) AS units_in_stock,
+       COALESCE(SUM(price * stock_quantity), 0) AS inventory_value
+FROM products;
+
+-- Low-stock alerts: stock_quantity <= threshold, per category when overridden
+CREATE INDEX idx_products_stock ON products(stock_quantity);
+CREATE INDEX idx_products_category_stock ON products(category, stock_quantity);
+
+-- Order placement: lock the product, check and decrement stock, insert the order (one transaction)
+CREATE OR REPLACE FUNCTION place_order(
+    p_customer_id INTEGER,
+    p_product_id INTEGER,
+    p_quantity INTEGER,
+    p_status TEXT DEFAULT 'pending',
+    p_tracking_number TEXT DEFAULT NULL,
+    p_notes TEXT DEFAULT NULL
+)
+RETURNS orders
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_product products%ROWTYPE;
+    v_order orders%ROWTYPE;
+BEGIN
+    IF p_quantity IS NULL OR p_quantity < 1 THEN
+        RAISE EXCEPTION 'Quantity must be at least 1';
+    END IF;
+    
+    SELECT * INTO v_product FROM products WHERE id = p_product_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Product % does not exist', p_product_id;
+    END IF;
+    IF COALESCE(v_product.stock_quantity, 0) < p_quantity THEN
+        RAISE EXCEPTION 'Insufficient stock for %: % left, % requested',
+            v_product.name, COALESCE(v_product.stock_quantity, 0), p_quantity;
+    END IF;
+    
+    UPDATE products SET stock_quantity = stock_quantity - p_quantity WHERE id = p_product_id;
+    
+    INSERT INTO orders (customer_id, product_id, quantity, total_amount, status, tracking_number, notes)
+    VALUES (p_customer_id, p_product_id, p_quantity, v_product.price * p_quantity,
+            p_status, p_tracking_number, p_notes)
+    RETURNING * INTO v_order;
+    RETURN v_order;
+END;
+$$;
+
+-- Cart checkout: every line of a basket in one transaction, tied together by an order group
+CREATE TABLE IF NOT EXISTS order_groups (
+    id SERIAL PRIMARY KEY,
+    customer_id INTEGER REFERENCES customers(id) ON DELETE CASCADE,
+    total_amount DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+ALTER TABLE order_groups ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Enable all operations on order_groups" ON order_groups FOR ALL USING (true) WITH CHECK (true);
+
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS group_id INTEGER REFERENCES order_groups(id) ON DELETE SET NULL;
+CREATE INDEX idx_orders_group ON orders(group_id);
+
+CREATE OR REPLACE FUNCTION place_order_group(
+    p_customer_id INTEGER,
+    p_items JSONB,  -- [{"product_id": 1, "quantity": 2}, ...]
+    p_status TEXT DEFAULT 'pending',
+    p_notes TEXT DEFAULT NULL
+)
+RETURNS SETOF orders
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_group_id INTEGER;
+    v_problems TEXT;
+BEGIN
+    IF p_items IS NULL OR jsonb_array_length(p_items) = 0 THEN
+        RAISE EXCEPTION 'The cart is empty';
+    END IF;
+    
+    -- Lock every product in the cart, in id order so concurrent checkouts can't deadlock
+    PERFORM 1 FROM products
+    WHERE id IN (SELECT (item->>'product_id')::INTEGER FROM jsonb_array_elements(p_items) item)
+    ORDER BY id
+    FOR UPDATE;
+    
+    SELECT string_agg(format('%s: %s left, %s requested',
+                             COALESCE(p.name, 'product ' || c.product_id), COALESCE(p.stock_quantity, 0), c.quantity), '; ')
+    INTO v_problems
+    FROM (SELECT (item->>'product_id')::INTEGER AS product_id, SUM((item->>'quantity')::INTEGER) AS quantity
+          FROM jsonb_array_elements(p_items) item GROUP BY 1) c
+    LEFT JOIN products p ON p.id = c.product_id
+    WHERE p.id IS NULL OR c.quantity < 1 OR COALESCE(p.stock_quantity, 0) < c.quantity;
+    IF v_problems IS NOT NULL THEN
+        RAISE EXCEPTION 'Insufficient stock for %', v_problems;
+    END IF;
+    
+    UPDATE products p SET stock_quantity = p.stock_quantity - c.quantity
+    FROM (SELECT (item->>'product_id')::INTEGER AS product_id, SUM((item->>'quantity')::INTEGER) AS quantity
+          FROM jsonb_array_elements(p_items) item GROUP BY 1) c
+    WHERE p.id = c.product_id;
+    
+    INSERT INTO order_groups (customer_id) VALUES (p_customer_id) RETURNING id INTO v_group_id;
+    
+    RETURN QUERY
+    INSERT INTO orders (customer_id, product_id, quantity, total_amount, status, notes, group_id)
+    SELECT p_customer_id, p.id, (item->>'quantity')::INTEGER, p.price * (item->>'quantity')::INTEGER,
+           p_status, p_notes, v_group_id
+    FROM jsonb_array_elements(p_items) item
+    JOIN products p ON p.id = (item->>'product_id')::INTEGER
+    RETURNING *;
+    
+    UPDATE order_groups
+    SET total_amount = (SELECT COALESCE(SUM(total_amount), 0) FROM orders WHERE group_id = v_group_id)
+    WHERE id = v_group_id;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION top_products_by_revenue(limit_count INTEGER DEFAULT 5)
+RETURNS TABLE (product_id INTEGER, name TEXT, quantity BIGINT, revenue NUMERIC)
+LANGUAGE sql STABLE AS $$
+    SELECT o.product_id, p.name, SUM(o.quantity)::BIGINT, SUM(o.total_amount)
+    FROM orders o
+    LEFT JOIN products p ON p.id = o.product_id
+    GROUP BY o.product_id, p.name
+    ORDER BY SUM(o.total_amount) DESC
+    LIMIT limit_count;
+$$;
+
+-- Daily sales rollup: one row per day, product and status, kept current by a trigger on orders
+CREATE TABLE IF NOT EXISTS daily_sales (
+    day DATE NOT NULL,
+    product_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    order_count INTEGER NOT NULL DEFAULT 0,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, product_id, status)
+);
+ALTER TABLE daily_sales ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Enable read access on daily_sales" ON daily_sales FOR SELECT USING (true);
+
+CREATE OR REPLACE FUNCTION apply_daily_sales(
+    p_day DATE, p_product_id INTEGER, p_status TEXT, p_sign INTEGER, p_quantity INTEGER, p_revenue NUMERIC
+)
+RETURNS VOID LANGUAGE sql SECURITY DEFINER SET search_path = public AS $$
+    INSERT INTO daily_sales AS d (day, product_id, status, order_count, quantity, revenue)
+    VALUES (p_day, COALESCE(p_product_id, 0), COALESCE(p_status, 'pending'),
+            p_sign, p_sign * p_quantity, p_sign * p_revenue)
+    ON CONFLICT (day, product_id, status) DO UPDATE
+    SET order_count = d.order_count + EXCLUDED.order_count,
+        quantity = d.quantity + EXCLUDED.quantity,
+        revenue = d.revenue + EXCLUDED.revenue;
+    DELETE FROM daily_sales
+    WHERE day = p_day AND product_id = COALESCE(p_product_id, 0)
+      AND status = COALESCE(p_status, 'pending') AND order_count = 0;
+$$;
+-- Only the trigger (running as the owner) may write the rollup; the anon role can just read it
+REVOKE EXECUTE ON FUNCTION apply_daily_sales(DATE, INTEGER, TEXT, INTEGER, INTEGER, NUMERIC) FROM PUBLIC, anon, authenticated;
+
+-- Each order change moves its old contribution out and its new one in, so only touched days are rewritten
+-- SECURITY DEFINER: the rollup has no write policy, so the trigger writes it as the owner, not the app's role
+CREATE OR REPLACE FUNCTION orders_maintain_daily_sales()
+RETURNS TRIGGER LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_daily_sales(OLD.created_at::DATE, OLD.product_id, OLD.status, -1, OLD.quantity, OLD.total_amount);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_daily_sales(NEW.created_at::DATE, NEW.product_id, NEW.status, 1, NEW.quantity, NEW.total_amount);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER orders_daily_sales
+AFTER INSERT OR DELETE OR UPDATE OF product_id, status, quantity, total_amount, created_at ON orders
+FOR EACH ROW EXECUTE FUNCTION orders_maintain_daily_sales();
+
+-- Backfill from the orders that existed before the trigger
+INSERT INTO daily_sales (day, product_id, status, order_count, quantity, revenue)
+SELECT created_at::DATE, COALESCE(product_id, 0), COALESCE(status, 'pending'), COUNT(*), SUM(quantity), SUM(total_amount)
+FROM orders
+GROUP BY 1, 2, 3
+ON CONFLICT DO NOTHING;
+
+-- Dashboard trend charts read one row per day
+CREATE OR REPLACE VIEW daily_sales_trend AS
+SELECT day, SUM(order_count)::INTEGER AS order_count, SUM(quantity)::INTEGER AS quantity, SUM(revenue) AS revenue
+FROM daily_sales
+GROUP BY day;
         """, language="sql")
         
-        st.success("✅ After running this SQL, you'll have 3 tables: customers, products, and orders")
+        st.success("✅ After running this SQL, you'll have 5 tables: customers, products, orders, "
+                   "order_groups (cart checkouts) and daily_sales (the dashboard's daily rollup)")
         
         st.markdown("---")
         
@@ -470,17 +3157,30 @@ updated_at
         
         st.divider()
         
+        revalidate = st.checkbox(
+            "Check Platzi for catalog changes",
+            value=False,
+            help=f"Fetched pages are cached on disk for {PLATZI_CACHE_TTL_SECONDS // 60} minutes"
+        )
+        
         if st.button("🔄 Fetch Courses from Platzi", type="primary", use_container_width=True):
+            progress = st.empty()
+            
+            def show_progress(fetched):
+                progress.info(f"📥 {len(fetched)} courses fetched so far: " +
+                              ", ".join(edge.get("node", {}).get("title", "?") for edge in fetched[-5:]) + " ...")
+            
             with st.spinner("Fetching courses from Platzi API..."):
-                courses = fetch_platzi_courses()
+                courses = fetch_platzi_courses(on_page=show_progress, revalidate=revalidate)
+            progress.empty()
+            
+            if courses:
+                st.success(f"✅ Found {len(courses)} courses from Platzi!")
                 
-                if courses:
-                    st.success(f"✅ Found {len(courses)} courses from Platzi!")
-                    
-                    # Store in session state to avoid re-fetching
-                    st.session_state['platzi_courses'] = courses
-                else:
-                    st.warning("⚠️ No courses found or API is temporarily unavailable")
+                # Store in session state to avoid re-fetching
+                st.session_state['platzi_courses'] = courses
+            else:
+                st.warning("⚠️ No courses found or API is temporarily unavailable")
         
         # Display fetched courses
         if 'platzi_courses' in st.session_state and st.session_state['platzi_courses']:
@@ -488,15 +3188,25 @@ updated_at
             
             st.markdown(f"### 📚 {len(courses)} Courses Available")
             
-            for idx, edge in enumerate(courses):
+            # Only the rendered courses are checked; bulk import looks up the rest as it goes
+            shown = courses[:PLATZI_DISPLAY_LIMIT]
+            existing_skus = get_existing_skus(supabase, [platzi_sku(edge.get("node", {})) for edge in shown])
+            if existing_skus:
+                st.caption(f"✅ {len(existing_skus)} of the courses shown are already imported")
+            
+            if len(courses) > PLATZI_DISPLAY_LIMIT:
+                st.caption(f"Showing the first {PLATZI_DISPLAY_LIMIT} courses; bulk import covers the whole catalog")
+            
+            for idx, edge in enumerate(shown):
                 node = edge.get("node", {})
                 teacher = node.get("teacher", {})
                 title = node.get("title", "Unknown Course")
                 slug = node.get("slug", "unknown")
                 description = node.get("description", "No description available")
                 teacher_name = teacher.get("name", "Unknown")
+                already_imported = platzi_sku(node) in existing_skus
                 
-                with st.expander(f"📖 {title}"):
+                with st.expander(f"{'✅' if already_imported else '📖'} {title}"):
                     col1, col2 = st.columns([3, 1])
                     
                     with col1:
@@ -514,7 +3224,9 @@ updated_at
                         st.markdown(f"- Stock: Unlimited (digital)")
                     
                     with col2:
-                        if st.button("📥 Import", key=f"import_{idx}", use_container_width=True):
+                        if already_imported:
+                            st.success("Already imported")
+                        elif st.button("📥 Import", key=f"import_{idx}", use_container_width=True):
                             success, message, product_id = import_platzi_course_as_product(
                                 supabase, 
                                 node, 
@@ -532,40 +3244,46 @@ updated_at
             st.divider()
             st.subheader("⚡ Bulk Import")
             
+            results = None
             col1, col2 = st.columns([2, 1])
             
             with col1:
                 st.markdown("Import all courses at once with the default price")
                 num_to_import = st.slider("Number of courses to import", 1, len(courses), min(5, len(courses)))
+                overwrite = st.checkbox("Update courses that were already imported", value=False)
             
             with col2:
                 if st.button("📥 Import All Selected", type="primary", use_container_width=True):
-                    success_count = 0
-                    error_count = 0
-                    
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    for idx in range(num_to_import):
-                        node = courses[idx].get("node", {})
-                        success, message, _ = import_platzi_course_as_product(
-                            supabase, 
-                            node, 
-                            default_price
-                        )
-                        
-                        if success:
-                            success_count += 1
-                        else:
-                            error_count += 1
-                        
-                        progress_bar.progress((idx + 1) / num_to_import)
-                        status_text.text(f"Processing: {idx + 1}/{num_to_import}")
+                    def show_progress(done, total):
+                        progress_bar.progress(done / total)
+                        status_text.text(f"Processing: {done}/{total}")
+                    
+                    results = bulk_import_platzi_courses(
+                        supabase,
+                        [edge.get("node", {}) for edge in courses[:num_to_import]],
+                        default_price,
+                        overwrite=overwrite,
+                        on_progress=show_progress
+                    )
                     
-                    st.success(f"✅ Imported {success_count} courses successfully!")
-                    if error_count > 0:
-                        st.warning(f"⚠️ {error_count} courses skipped (may already exist)")
-                    st.balloons()
+                    outcome_counts = {}
+                    for result in results:
+                        outcome_counts[result["outcome"]] = outcome_counts.get(result["outcome"], 0) + 1
+                    
+                    imported = outcome_counts.get("inserted", 0) + outcome_counts.get("updated", 0)
+                    st.success(f"✅ Imported {imported} courses successfully!")
+                    if outcome_counts.get("skipped"):
+                        st.warning(f"⚠️ {outcome_counts['skipped']} courses skipped (already exist)")
+                    if outcome_counts.get("failed"):
+                        st.error(f"❌ {outcome_counts['failed']} courses failed to import")
+                    if imported:
+                        st.balloons()
+            
+            if results:
+                st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
         else:
             st.info("👆 Click the button above to fetch courses from Platzi API")
     
@@ -576,7 +3294,7 @@ updated_at
     elif page == "👥 Customers":
         st.header("👥 Customer Management")
         
-        tab1, tab2, tab3 = st.tabs(["📝 Add Customer", "📋 View Customers", "🔍 Search Customers"])
+        tab1, tab2, tab3, tab4 = st.tabs(["📝 Add Customer", "📋 View Customers", "🔍 Search Customers", "📥 Import File"])
         
         # TAB 1: Add Customer
         with tab1:
@@ -629,41 +3347,64 @@ updated_at
             st.subheader("All Customers")
             
             if st.button("🔄 Refresh Data", use_container_width=False):
+                invalidate_cache("customers")
                 st.rerun()
             
-            customers = get_all_customers(supabase)
+            page_size = st.selectbox(
+                "Customers per page",
+                PAGE_SIZE_OPTIONS,
+                key="customers_page_size",
+                on_change=reset_pagination,
+                args=("customers",)
+            )
+            customers, next_cursor = get_customers_page(supabase, page_size, get_page_cursor("customers"))
+            leave_empty_page("customers", customers)
             
             if customers:
-                st.success(f"✅ Found {len(customers)} customers")
+                st.success(f"✅ Showing {len(customers)} customers")
                 
-                # Display as DataFrame
+                # Display as a selectable table; details render only for the selected row
                 df = pd.DataFrame(customers)
                 display_cols = ["id", "name", "email", "phone", "city", "state", "created_at"]
                 available_cols = [col for col in display_cols if col in df.columns]
-                st.dataframe(df[available_cols], use_container_width=True, hide_index=True)
+                event = st.dataframe(
+                    df[available_cols],
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key=table_key("customers")
+                )
                 
-                # Individual customer details
+                # Selected customer details
                 st.divider()
-                for customer in customers:
-                    with st.expander(f"👤 {customer['name']} (ID: {customer['id']})"):
-                        col1, col2 = st.columns([3, 1])
-                        
-                        with col1:
-                            st.markdown(f"**Email:** {customer['email']}")
-                            st.markdown(f"**Phone:** {customer['phone']}")
-                            st.markdown(f"**Address:** {customer['address']}")
-                            st.markdown(f"**City:** {customer.get('city', 'N/A')}, {customer.get('state', 'N/A')} {customer.get('zip_code', '')}")
-                            st.markdown(f"**Country:** {customer.get('country', 'N/A')}")
-                            st.markdown(f"**Added:** {customer.get('created_at', 'N/A')}")
-                        
-                        with col2:
-                            if st.button("🗑️ Delete", key=f"del_cust_{customer['id']}", use_container_width=True):
-                                success, message = delete_customer(supabase, customer['id'])
-                                if success:
-                                    st.success(message)
-                                    st.rerun()
-                                else:
-                                    st.error(message)
+                selected = selected_row(event, customers)
+                customer = get_customer(supabase, selected['id']) if selected else None
+                if customer:
+                    st.markdown(f"#### 👤 {customer['name']} (ID: {customer['id']})")
+                    col1, col2 = st.columns([3, 1])
+                    
+                    with col1:
+                        st.markdown(f"**Email:** {customer['email']}")
+                        st.markdown(f"**Phone:** {customer['phone']}")
+                        st.markdown(f"**Address:** {customer['address']}")
+                        st.markdown(f"**City:** {customer.get('city', 'N/A')}, {customer.get('state', 'N/A')} {customer.get('zip_code', '')}")
+                        st.markdown(f"**Country:** {customer.get('country', 'N/A')}")
+                        st.markdown(f"**Added:** {customer.get('created_at', 'N/A')}")
+                    
+                    with col2:
+                        if st.button("🗑️ Delete", key=f"del_cust_{customer['id']}", use_container_width=True):
+                            success, message = delete_customer(supabase, customer['id'])
+                            if success:
+                                st.success(message)
+                                clear_table_selection("customers")
+                                st.rerun()
+                            else:
+                                st.error(message)
+                else:
+                    st.caption("👆 Select a customer in the table to see details and actions")
+                
+                render_page_controls("customers", next_cursor)
             else:
                 st.info("📭 No customers found. Add your first customer!")
         
@@ -672,16 +3413,23 @@ updated_at
             st.subheader("Search Customers")
             search_term = st.text_input("🔍 Search by name or email", placeholder="Enter name or email...")
             
-            if search_term:
-                customers = get_all_customers(supabase)
-                filtered = [c for c in customers if search_term.lower() in c['name'].lower() or search_term.lower() in c['email'].lower()]
+            if search_term.strip():
+                filtered = search_customers(supabase, search_term)
                 
                 if filtered:
-                    st.success(f"✅ Found {len(filtered)} matching customers")
+                    if len(filtered) == SEARCH_RESULT_LIMIT:
+                        st.success(f"✅ Showing the top {SEARCH_RESULT_LIMIT} matches (refine your search to narrow it down)")
+                    else:
+                        st.success(f"✅ Found {len(filtered)} matching customers")
                     df = pd.DataFrame(filtered)
                     st.dataframe(df, use_container_width=True, hide_index=True)
                 else:
                     st.warning("No customers found matching your search")
+        
+        # TAB 4: Import File
+        with tab4:
+            st.subheader("Import Customers from a File")
+            render_file_import(supabase, "customers")
     
     # ========================================
     # PAGE: PRODUCTS
@@ -690,7 +3438,7 @@ updated_at
     elif page == "📦 Products":
         st.header("📦 Product Management")
         
-        tab1, tab2 = st.tabs(["📝 Add Product", "📋 View Products"])
+        tab1, tab2, tab3 = st.tabs(["📝 Add Product", "📋 View Products", "📥 Import File"])
         
         # TAB 1: Add Product
         with tab1:
@@ -743,58 +3491,91 @@ updated_at
             st.subheader("All Products")
             
             if st.button("🔄 Refresh Data", use_container_width=False):
+                invalidate_cache("products")
                 st.rerun()
             
-            products = get_all_products(supabase)
+            page_size = st.selectbox(
+                "Products per page",
+                PAGE_SIZE_OPTIONS,
+                key="products_page_size",
+                on_change=reset_pagination,
+                args=("products",)
+            )
+            products, next_cursor = get_products_page(supabase, page_size, get_page_cursor("products"))
+            leave_empty_page("products", products)
             
             if products:
-                st.success(f"✅ Found {len(products)} products")
+                st.success(f"✅ Showing {len(products)} products")
                 
                 # Calculate total inventory value
-                total_value = sum([p['price'] * p.get('stock_quantity', 0) for p in products])
-                st.metric("Total Inventory Value", f"${total_value:,.2f}")
+                if AGGREGATION_MODE == "database":
+                    valuation = get_inventory_valuation(supabase)
+                elif AGGREGATION_MODE == "replica":
+                    valuation = get_replica_inventory_valuation(supabase)
+                else:
+                    valuation = inventory_valuation(get_all_products(supabase, PRODUCT_COLUMNS["valuation"]))
+                st.metric("Total Inventory Value", f"${valuation['inventory_value']:,.2f}")
                 
-                # Display as DataFrame
+                # Display as a selectable table; details render only for the selected row
                 df = pd.DataFrame(products)
                 display_cols = ["id", "name", "sku", "price", "cost", "stock_quantity", "category"]
                 available_cols = [col for col in display_cols if col in df.columns]
-                st.dataframe(df[available_cols], use_container_width=True, hide_index=True)
+                event = st.dataframe(
+                    df[available_cols],
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key=table_key("products")
+                )
                 
-                # Individual product details
+                # Selected product details
                 st.divider()
-                for product in products:
+                selected = selected_row(event, products)
+                product = get_product(supabase, selected['id']) if selected else None
+                if product:
                     profit = (product['price'] - product.get('cost', 0)) if product.get('cost') else 0
                     profit_margin = (profit / product['price'] * 100) if product['price'] > 0 else 0
                     
-                    with st.expander(f"📦 {product['name']} - ${product['price']:.2f} (ID: {product['id']})"):
-                        col1, col2, col3 = st.columns([2, 2, 1])
-                        
-                        with col1:
-                            st.markdown(f"**SKU:** {product['sku']}")
-                            st.markdown(f"**Price:** ${product['price']:.2f}")
-                            st.markdown(f"**Cost:** ${product.get('cost', 0):.2f}")
-                            st.markdown(f"**Profit per Unit:** ${profit:.2f} ({profit_margin:.1f}%)")
-                        
-                        with col2:
-                            st.markdown(f"**Stock:** {product.get('stock_quantity', 0)} units")
-                            st.markdown(f"**Category:** {product.get('category', 'N/A')}")
-                            st.markdown(f"**Supplier:** {product.get('supplier_name', 'N/A')}")
-                            if product.get('supplier_url'):
-                                st.markdown(f"**URL:** [{product['supplier_url']}]({product['supplier_url']})")
-                        
-                        with col3:
-                            if st.button("🗑️ Delete", key=f"del_prod_{product['id']}", use_container_width=True):
-                                success, message = delete_product(supabase, product['id'])
-                                if success:
-                                    st.success(message)
-                                    st.rerun()
-                                else:
-                                    st.error(message)
-                        
-                        if product.get('description'):
-                            st.markdown(f"**Description:** {product['description']}")
+                    st.markdown(f"#### 📦 {product['name']} - ${product['price']:.2f} (ID: {product['id']})")
+                    col1, col2, col3 = st.columns([2, 2, 1])
+                    
+                    with col1:
+                        st.markdown(f"**SKU:** {product['sku']}")
+                        st.markdown(f"**Price:** ${product['price']:.2f}")
+                        st.markdown(f"**Cost:** ${product.get('cost', 0):.2f}")
+                        st.markdown(f"**Profit per Unit:** ${profit:.2f} ({profit_margin:.1f}%)")
+                    
+                    with col2:
+                        st.markdown(f"**Stock:** {product.get('stock_quantity', 0)} units")
+                        st.markdown(f"**Category:** {product.get('category', 'N/A')}")
+                        st.markdown(f"**Supplier:** {product.get('supplier_name', 'N/A')}")
+                        if product.get('supplier_url'):
+                            st.markdown(f"**URL:** [{product['supplier_url']}]({product['supplier_url']})")
+                    
+                    with col3:
+                        if st.button("🗑️ Delete", key=f"del_prod_{product['id']}", use_container_width=True):
+                            success, message = delete_product(supabase, product['id'])
+                            if success:
+                                st.success(message)
+                                clear_table_selection("products")
+                                st.rerun()
+                            else:
+                                st.error(message)
+                    
+                    if product.get('description'):
+                        st.markdown(f"**Description:** {product['description']}")
+                else:
+                    st.caption("👆 Select a product in the table to see details and actions")
+                
+                render_page_controls("products", next_cursor)
             else:
                 st.info("📭 No products found. Add your first product!")
+        
+        # TAB 3: Import File
+        with tab3:
+            st.subheader("Import Products from a File")
+            render_file_import(supabase, "products")
     
     # ========================================
     # PAGE: ORDERS
@@ -809,31 +3590,51 @@ updated_at
         with tab1:
             st.subheader("Create New Order")
             
-            # Get customers and products for dropdowns
-            customers = get_all_customers(supabase)
-            products = get_all_products(supabase)
+            # Typeahead: only the top matches are fetched for each dropdown
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                customer_search = st.text_input("🔍 Find Customer", placeholder="Name or email...", key="order_customer_search")
+            
+            with col2:
+                product_search = st.text_input("🔍 Find Product", placeholder="Name or SKU...", key="order_product_search")
+            
+            customers = search_customer_options(supabase, customer_search)
+            products = search_product_options(supabase, product_search)
             
             if not customers:
-                st.warning("⚠️ No customers found. Please add customers first!")
+                if customer_search.strip():
+                    st.warning("⚠️ No customers match your search.")
+                else:
+                    st.warning("⚠️ No customers found. Please add customers first!")
             elif not products:
-                st.warning("⚠️ No products found. Please add products first!")
+                if product_search.strip():
+                    st.warning("⚠️ No products match your search.")
+                else:
+                    st.warning("⚠️ No products found. Please add products first!")
             else:
                 with st.form("create_order_form", clear_on_submit=True):
                     col1, col2 = st.columns(2)
                     
                     with col1:
                         # Customer selection
-                        customer_options = {f"{c['name']} ({c['email']})": c['id'] for c in customers}
-                        selected_customer = st.selectbox("Select Customer *", options=list(customer_options.keys()))
-                        customer_id = customer_options[selected_customer]
+                        customer_labels = {c['id']: f"{c['name']} ({c['email']})" for c in customers}
+                        customer_id = st.selectbox(
+                            "Select Customer *",
+                            options=list(customer_labels.keys()),
+                            format_func=customer_labels.get
+                        )
                         
                         # Product selection
-                        product_options = {f"{p['name']} - ${p['price']:.2f} (Stock: {p.get('stock_quantity', 0)})": p['id'] for p in products}
-                        selected_product = st.selectbox("Select Product *", options=list(product_options.keys()))
-                        product_id = product_options[selected_product]
+                        product_by_id = {p['id']: p for p in products}
+                        product_id = st.selectbox(
+                            "Select Product *",
+                            options=list(product_by_id.keys()),
+                            format_func=lambda pid: f"{product_by_id[pid]['name']} - ${product_by_id[pid]['price']:.2f} (Stock: {product_by_id[pid].get('stock_quantity', 0)})"
+                        )
                         
                         # Get selected product details
-                        selected_prod_details = next(p for p in products if p['id'] == product_id)
+                        selected_prod_details = product_by_id[product_id]
                         
                         quantity = st.number_input("Quantity *", min_value=1, value=1, step=1)
                         total_amount = selected_prod_details['price'] * quantity
@@ -844,109 +3645,274 @@ updated_at
                         tracking_number = st.text_input("Tracking Number", placeholder="Optional")
                         notes = st.text_area("Order Notes", placeholder="Special instructions or notes...")
                     
-                    submitted = st.form_submit_button("✅ Create Order", type="primary", use_container_width=True)
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        submitted = st.form_submit_button("✅ Create Order", type="primary", use_container_width=True)
+                    with col2:
+                        add_to_cart = st.form_submit_button("🛒 Add to Cart", use_container_width=True)
+                    
+                    if add_to_cart:
+                        cart = st.session_state.setdefault("cart", {"customer_id": None, "lines": {}})
+                        if cart["lines"] and cart["customer_id"] != customer_id:
+                            st.error("❌ The cart belongs to another customer. Check it out or clear it first.")
+                        else:
+                            cart["customer_id"] = customer_id
+                            cart["customer_label"] = customer_labels[customer_id]
+                            line = cart["lines"].setdefault(product_id, {
+                                "product_id": product_id,
+                                "name": selected_prod_details['name'],
+                                "price": selected_prod_details['price'],
+                                "quantity": 0
+                            })
+                            line["quantity"] += quantity
+                            st.success(f"🛒 Added {quantity} × {selected_prod_details['name']} to the cart")
                     
                     if submitted:
-                        order_data = {
-                            "customer_id": customer_id,
-                            "product_id": product_id,
-                            "quantity": quantity,
-                            "total_amount": total_amount,
-                            "status": status,
-                            "tracking_number": tracking_number if tracking_number else None,
-                            "notes": notes if notes else None
-                        }
-                        success, message, order_id = add_order(supabase, order_data)
+                        # Stock check, stock decrement and insert happen atomically in the database
+                        success, message, order_id = place_order(
+                            supabase,
+                            customer_id,
+                            product_id,
+                            quantity,
+                            status,
+                            tracking_number if tracking_number else None,
+                            notes if notes else None
+                        )
                         if success:
                             st.success(message)
                             st.balloons()
                         else:
                             st.error(message)
+            
+            # Cart: every line is checked out in a single request
+            cart = st.session_state.get("cart")
+            if cart and cart["lines"]:
+                st.divider()
+                st.subheader(f"🛒 Cart for {cart['customer_label']}")
+                
+                lines = list(cart["lines"].values())
+                st.dataframe(pd.DataFrame([{
+                    "Product": line["name"],
+                    "Quantity": line["quantity"],
+                    "Unit Price": line["price"],
+                    "Subtotal": line["price"] * line["quantity"]
+                } for line in lines]), use_container_width=True, hide_index=True)
+                st.metric("Cart Total", f"${sum(line['price'] * line['quantity'] for line in lines):,.2f}")
+                
+                col1, col2, col3 = st.columns([2, 1, 1])
+                
+                with col1:
+                    cart_status = st.selectbox("Order Status", ["pending", "processing", "shipped", "delivered", "cancelled"],
+                                               key="cart_status")
+                
+                with col2:
+                    checkout = st.button(f"✅ Checkout ({len(lines)} items)", type="primary", use_container_width=True)
+                
+                with col3:
+                    if st.button("🗑️ Clear Cart", use_container_width=True):
+                        st.session_state.pop("cart")
+                        st.rerun()
+                
+                if checkout:
+                    success, message, orders = place_order_group(supabase, cart["customer_id"], lines, cart_status)
+                    if success:
+                        st.session_state.pop("cart")
+                        st.success(message)
+                        st.balloons()
+                    else:
+                        st.error(message)
         
         # TAB 2: View All Orders
         with tab2:
             st.subheader("All Orders")
             
             if st.button("🔄 Refresh Data", use_container_width=False):
+                invalidate_cache("orders")
                 st.rerun()
             
-            orders = get_all_orders(supabase)
+            col1, col2, col3 = st.columns([2, 2, 1])
             
-            if orders:
-                st.success(f"✅ Found {len(orders)} orders")
-                
-                # Calculate total revenue
-                total_revenue = sum([o['total_amount'] for o in orders])
-                st.metric("Total Revenue", f"${total_revenue:,.2f}")
-                
+            with col1:
                 # Status filter
                 status_filter = st.multiselect(
                     "Filter by Status",
                     ["pending", "processing", "shipped", "delivered", "cancelled"],
-                    default=["pending", "processing", "shipped"]
+                    default=["pending", "processing", "shipped"],
+                    key="orders_status_filter",
+                    on_change=reset_pagination,
+                    args=("orders",)
+                )
+            
+            with col2:
+                # Date filter: empty means any time, one date means from that day on
+                created_range = st.date_input(
+                    "Created between",
+                    value=(),
+                    key="orders_created_filter",
+                    on_change=reset_pagination,
+                    args=("orders",)
+                )
+            
+            with col3:
+                page_size = st.selectbox(
+                    "Orders per page",
+                    PAGE_SIZE_OPTIONS,
+                    key="orders_page_size",
+                    on_change=reset_pagination,
+                    args=("orders",)
+                )
+            
+            created_from = created_range[0] if created_range else None
+            created_before = created_range[1] + timedelta(days=1) if len(created_range) > 1 else None
+            
+            # Calculate total revenue
+            if AGGREGATION_MODE == "database":
+                total_revenue = get_order_totals(supabase)["total_revenue"]
+            elif AGGREGATION_MODE == "replica":
+                total_revenue = get_replica_order_totals(supabase)["total_revenue"]
+            else:
+                total_revenue = order_revenue_total(build_orders_frame(get_all_orders(supabase)))
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.metric("Matching Orders", count_orders(supabase, status_filter, created_from, created_before))
+            
+            with col2:
+                st.metric("Total Revenue", f"${total_revenue:,.2f}")
+            
+            orders, next_cursor = get_orders_page(
+                supabase, page_size, get_page_cursor("orders"), status_filter, created_from, created_before
+            )
+            leave_empty_page("orders", orders)
+            
+            if orders:
+                st.success(f"✅ Showing {len(orders)} orders")
+                
+                status_emoji = {
+                    "pending": "⏳",
+                    "processing": "🔄",
+                    "shipped": "📦",
+                    "delivered": "✅",
+                    "cancelled": "❌"
+                }
+                
+                # Display as a selectable table; details render only for the selected row
+                df = pd.DataFrame([
+                    {
+                        "id": order['id'],
+                        "status": f"{status_emoji.get(order['status'], '📋')} {order['status']}",
+                        "customer": (order.get('customers') or {}).get('name', 'N/A'),
+                        "product": (order.get('products') or {}).get('name', 'N/A'),
+                        "quantity": order['quantity'],
+                        "total_amount": order['total_amount'],
+                        "created_at": order.get('created_at')
+                    }
+                    for order in orders
+                ])
+                event = st.dataframe(
+                    df,
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select="rerun",
+                    selection_mode="multi-row",
+                    key=table_key("orders")
                 )
                 
-                filtered_orders = [o for o in orders if o['status'] in status_filter]
+                st.divider()
+                chosen = selected_rows(event, orders)
+                order = chosen[0] if len(chosen) == 1 else None
+                
+                # Bulk actions for several selected orders, applied in one request each
+                if len(chosen) > 1:
+                    chosen_ids = [o['id'] for o in chosen]
+                    st.markdown(f"#### 📋 {len(chosen)} orders selected")
+                    col1, col2, col3 = st.columns([2, 1, 1])
+                    
+                    with col1:
+                        bulk_status = st.selectbox(
+                            "New Status",
+                            ["pending", "processing", "shipped", "delivered", "cancelled"],
+                            key="bulk_status"
+                        )
+                    
+                    with col2:
+                        if st.button(f"💾 Update {len(chosen)} Orders", use_container_width=True):
+                            success, message = update_orders_status(supabase, chosen_ids, bulk_status)
+                            if success:
+                                st.success(message)
+                                clear_table_selection("orders")
+                                st.rerun()
+                            else:
+                                st.error(message)
+                    
+                    with col3:
+                        if st.button(f"🗑️ Delete {len(chosen)} Orders", use_container_width=True):
+                            success, message = delete_orders(supabase, chosen_ids)
+                            if success:
+                                st.success(message)
+                                clear_table_selection("orders")
+                                st.rerun()
+                            else:
+                                st.error(message)
                 
-                # Display orders
-                for order in filtered_orders:
+                # Selected order details
+                elif order:
                     customer = order.get('customers', {})
                     product = order.get('products', {})
                     
-                    status_emoji = {
-                        "pending": "⏳",
-                        "processing": "🔄",
-                        "shipped": "📦",
-                        "delivered": "✅",
-                        "cancelled": "❌"
-                    }
+                    st.markdown(f"#### {status_emoji.get(order['status'], '📋')} Order #{order['id']} - ${order['total_amount']:.2f} ({order['status']})")
+                    col1, col2, col3 = st.columns([2, 2, 1])
                     
-                    with st.expander(f"{status_emoji.get(order['status'], '📋')} Order #{order['id']} - ${order['total_amount']:.2f} ({order['status']})"):
-                        col1, col2, col3 = st.columns([2, 2, 1])
-                        
-                        with col1:
-                            st.markdown("**Customer Details:**")
-                            st.markdown(f"Name: {customer.get('name', 'N/A')}")
-                            st.markdown(f"Email: {customer.get('email', 'N/A')}")
-                            st.markdown(f"Phone: {customer.get('phone', 'N/A')}")
-                        
-                        with col2:
-                            st.markdown("**Order Details:**")
-                            st.markdown(f"Product: {product.get('name', 'N/A')}")
-                            st.markdown(f"SKU: {product.get('sku', 'N/A')}")
-                            st.markdown(f"Quantity: {order['quantity']}")
-                            st.markdown(f"Total: ${order['total_amount']:.2f}")
-                            if order.get('tracking_number'):
-                                st.markdown(f"Tracking: {order['tracking_number']}")
-                        
-                        with col3:
-                            new_status = st.selectbox(
-                                "Update Status",
-                                ["pending", "processing", "shipped", "delivered", "cancelled"],
-                                index=["pending", "processing", "shipped", "delivered", "cancelled"].index(order['status']),
-                                key=f"status_{order['id']}"
-                            )
-                            
-                            if st.button("💾 Update", key=f"update_{order['id']}", use_container_width=True):
-                                success, message = update_order_status(supabase, order['id'], new_status)
-                                if success:
-                                    st.success(message)
-                                    st.rerun()
-                                else:
-                                    st.error(message)
-                            
-                            if st.button("🗑️ Delete", key=f"del_order_{order['id']}", use_container_width=True):
-                                success, message = delete_order(supabase, order['id'])
-                                if success:
-                                    st.success(message)
-                                    st.rerun()
-                                else:
-                                    st.error(message)
+                    with col1:
+                        st.markdown("**Customer Details:**")
+                        st.markdown(f"Name: {customer.get('name', 'N/A')}")
+                        st.markdown(f"Email: {customer.get('email', 'N/A')}")
+                        st.markdown(f"Phone: {customer.get('phone', 'N/A')}")
+                    
+                    with col2:
+                        st.markdown("**Order Details:**")
+                        st.markdown(f"Product: {product.get('name', 'N/A')}")
+                        st.markdown(f"SKU: {product.get('sku', 'N/A')}")
+                        st.markdown(f"Quantity: {order['quantity']}")
+                        st.markdown(f"Total: ${order['total_amount']:.2f}")
+                        if order.get('tracking_number'):
+                            st.markdown(f"Tracking: {order['tracking_number']}")
+                    
+                    with col3:
+                        new_status = st.selectbox(
+                            "Update Status",
+                            ["pending", "processing", "shipped", "delivered", "cancelled"],
+                            index=["pending", "processing", "shipped", "delivered", "cancelled"].index(order['status']),
+                            key=f"status_{order['id']}"
+                        )
                         
-                        if order.get('notes'):
-                            st.markdown(f"**Notes:** {order['notes']}")
+                        if st.button("💾 Update", key=f"update_{order['id']}", use_container_width=True):
+                            success, message = update_order_status(supabase, order['id'], new_status)
+                            if success:
+                                st.success(message)
+                                clear_table_selection("orders")
+                                st.rerun()
+                            else:
+                                st.error(message)
                         
-                        st.markdown(f"**Created:** {order.get('created_at', 'N/A')}")
+                        if st.button("🗑️ Delete", key=f"del_order_{order['id']}", use_container_width=True):
+                            success, message = delete_order(supabase, order['id'])
+                            if success:
+                                st.success(message)
+                                clear_table_selection("orders")
+                                st.rerun()
+                            else:
+                                st.error(message)
+                    
+                    if order.get('notes'):
+                        st.markdown(f"**Notes:** {order['notes']}")
+                    
+                    st.markdown(f"**Created:** {order.get('created_at', 'N/A')}")
+                else:
+                    st.caption("👆 Select an order to see details, or several orders for bulk actions")
+                
+                render_page_controls("orders", next_cursor)
             else:
                 st.info("📭 No orders found. Create your first order!")
     
@@ -957,10 +3923,17 @@ updated_at
     elif page == "📊 Dashboard":
         st.header("📊 Business Dashboard")
         
-        # Get all data
-        customers = get_all_customers(supabase)
-        products = get_all_products(supabase)
-        orders = get_all_orders(supabase)
+        # Aggregate in the database, in the local replica, or client-side from full table reads
+        if AGGREGATION_MODE == "database":
+            metrics = get_dashboard_metrics(supabase)
+        elif AGGREGATION_MODE == "replica":
+            metrics = get_replica_dashboard_metrics(supabase)
+        else:
+            metrics = compute_dashboard_metrics(
+                get_all_customers(supabase, CUSTOMER_COLUMNS["count"]),
+                get_all_products(supabase, PRODUCT_COLUMNS["options"]),
+                get_all_orders(supabase)
+            )
         
         # Key Metrics
         st.subheader("📈 Key Metrics")
@@ -968,72 +3941,78 @@ updated_at
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Customers", len(customers))
+            st.metric("Total Customers", metrics["total_customers"])
         
         with col2:
-            st.metric("Total Products", len(products))
+            st.metric("Total Products", metrics["total_products"])
         
         with col3:
-            st.metric("Total Orders", len(orders))
+            st.metric("Total Orders", metrics["total_orders"])
         
         with col4:
-            total_revenue = sum([o['total_amount'] for o in orders]) if orders else 0
-            st.metric("Total Revenue", f"${total_revenue:,.2f}")
+            st.metric("Total Revenue", f"${metrics['total_revenue']:,.2f}")
+        
+        st.divider()
+        
+        # Sales Trends (one row per day from the daily_sales rollup)
+        st.subheader("📉 Sales Trends")
+        
+        period = st.selectbox("Period", SALES_TREND_PERIODS, index=1, format_func=lambda days: f"Last {days} days")
+        until = date.today()
+        since = until - timedelta(days=period - 1)
+        
+        if AGGREGATION_MODE == "database":
+            trend = get_daily_sales_trend(supabase, since)
+        elif AGGREGATION_MODE == "replica":
+            trend = get_replica_daily_sales_trend(supabase, since)
+        else:
+            trend = daily_sales_trend(build_orders_frame(get_all_orders(supabase)), since)
+        
+        if trend:
+            trend_df = sales_trend_frame(trend, since, until)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig = px.line(trend_df, x="day", y="revenue", labels={"day": "Day", "revenue": "Revenue ($)"},
+                              title="Revenue per Day")
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                fig = px.bar(trend_df, x="day", y="order_count", hover_data=["quantity"],
+                             labels={"day": "Day", "order_count": "Orders", "quantity": "Units"},
+                             title="Orders per Day")
+                st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info(f"No orders in the last {period} days.")
         
         st.divider()
         
         # Order Status Breakdown
-        if orders:
+        if metrics["status_summary"]:
             st.subheader("📦 Order Status Breakdown")
             
-            status_counts = {}
-            for order in orders:
-                status = order['status']
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("**Orders by Status:**")
-                for status, count in status_counts.items():
-                    st.markdown(f"- **{status.title()}:** {count} orders")
+                for row in metrics["status_summary"]:
+                    st.markdown(f"- **{row['status'].title()}:** {row['order_count']} orders")
             
             with col2:
                 # Revenue by status
                 st.markdown("**Revenue by Status:**")
-                status_revenue = {}
-                for order in orders:
-                    status = order['status']
-                    status_revenue[status] = status_revenue.get(status, 0) + order['total_amount']
-                
-                for status, revenue in status_revenue.items():
-                    st.markdown(f"- **{status.title()}:** ${revenue:,.2f}")
+                for row in metrics["status_summary"]:
+                    st.markdown(f"- **{row['status'].title()}:** ${row['revenue']:,.2f}")
         
         st.divider()
         
         # Top Products
-        if orders and products:
+        if metrics["top_products"]:
             st.subheader("🏆 Top Selling Products")
             
-            product_sales = {}
-            for order in orders:
-                product_id = order['product_id']
-                if product_id not in product_sales:
-                    product_sales[product_id] = {
-                        'quantity': 0,
-                        'revenue': 0
-                    }
-                product_sales[product_id]['quantity'] += order['quantity']
-                product_sales[product_id]['revenue'] += order['total_amount']
-            
-            # Get product names
-            product_dict = {p['id']: p['name'] for p in products}
-            
-            # Sort by revenue
-            sorted_products = sorted(product_sales.items(), key=lambda x: x[1]['revenue'], reverse=True)[:5]
-            
-            for product_id, stats in sorted_products:
-                product_name = product_dict.get(product_id, f"Product ID {product_id}")
+            for stats in metrics["top_products"]:
+                product_name = stats.get('name') or f"Product ID {stats['product_id']}"
                 col1, col2 = st.columns([3, 1])
                 with col1:
                     st.markdown(f"**{product_name}**")
@@ -1045,10 +4024,8 @@ updated_at
         # Recent Activity
         st.subheader("🕒 Recent Activity")
         
-        if orders:
-            recent_orders = sorted(orders, key=lambda x: x.get('created_at', ''), reverse=True)[:5]
-            
-            for order in recent_orders:
+        if metrics["recent_orders"]:
+            for order in metrics["recent_orders"]:
                 customer = order.get('customers', {})
                 product = order.get('products', {})
                 
@@ -1067,16 +4044,84 @@ updated_at
         st.divider()
         st.subheader("⚠️ Inventory Alerts")
         
-        low_stock_threshold = 10
-        low_stock_products = [p for p in products if p.get('stock_quantity', 0) <= low_stock_threshold]
+        if AGGREGATION_MODE == "database":
+            low_stock_products, low_stock_count = get_low_stock_products(supabase)
+        elif AGGREGATION_MODE == "replica":
+            low_stock_products, low_stock_count = get_replica_low_stock_products(supabase)
+        else:
+            low_stock_products, low_stock_count = find_low_stock_products(
+                get_all_products(supabase, PRODUCT_COLUMNS["alerts"])
+            )
         
         if low_stock_products:
-            st.warning(f"Found {len(low_stock_products)} products with low stock!")
+            st.warning(f"Found {low_stock_count} products with low stock!")
+            if low_stock_count > len(low_stock_products):
+                st.caption(f"Showing the {len(low_stock_products)} lowest")
             
             for product in low_stock_products:
                 st.markdown(f"- **{product['name']}** (SKU: {product['sku']}): {product.get('stock_quantity', 0)} units remaining")
         else:
             st.success("✅ All products have sufficient stock!")
+    
+    # ========================================
+    # PAGE: EXPORT
+    # ========================================
+    
+    elif page == "📤 Export":
+        st.header("📤 Export Data")
+        
+        st.info("Exports stream each table page by page, so memory use stays flat however large the table is.")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            table = st.selectbox(
+                "Table",
+                list(EXPORT_COLUMNS),
+                format_func=str.title,
+                help="Orders include the customer's name, email and phone and the product's name, SKU and price"
+            )
+        
+        with col2:
+            fmt = st.radio("Format", ["csv", "parquet"], format_func=str.upper, horizontal=True)
+            if fmt == "parquet" and not parquet_available():
+                st.warning("⚠️ Parquet export needs pyarrow. Run: pip install pyarrow")
+        
+        if st.button("📤 Export", type="primary", use_container_width=True):
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            path = os.path.join(EXPORT_DIR, f"{table}_{datetime.now():%Y%m%d_%H%M%S}.{fmt}")
+            progress = st.empty()
+            
+            success, message, rows_written = export_table(
+                supabase, table, path, fmt,
+                on_progress=lambda n: progress.info(f"📥 {n:,} rows written...")
+            )
+            progress.empty()
+            
+            if success:
+                st.success(message)
+                st.session_state['export_path'] = path
+            else:
+                st.error(message)
+        
+        export_path = st.session_state.get('export_path')
+        if export_path and os.path.exists(export_path):
+            st.markdown(f"**Latest export:** `{os.path.abspath(export_path)}`")
+            size_mb = os.path.getsize(export_path) / (1024 * 1024)
+            if size_mb <= EXPORT_DOWNLOAD_MAX_MB:
+                # Deferred: the file is only read when the button is clicked, not on every rerun
+                st.download_button(
+                    "💾 Download",
+                    partial(read_export_file, export_path),
+                    file_name=os.path.basename(export_path),
+                    mime="text/csv" if export_path.endswith(".csv") else "application/octet-stream",
+                    use_container_width=True
+                )
+            else:
+                st.caption(f"📁 {size_mb:,.0f} MB is too large to download through the browser; copy it from the path above")
+    
+    if INSTRUMENTATION_ENABLED:
+        render_performance_panel()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,773 @@
+"""
+Offline benchmark suite for the Dropshipping Management System.
+
+Runs every page's data path against an in-memory Supabase stand-in filled
+with synthetic data, then renders each Streamlit page through AppTest.
+No network or Supabase project is needed.
+
+    python benchmark.py --customers 100000 --products 20000 --orders 1000000
+    python benchmark.py --json results.json
+    python benchmark.py --compare results.json
+
+Besides wall time, each scenario reports how many requests it sent and how
+many rows came back. Those two columns don't depend on the stand-in's own
+speed, so they are the ones to watch across commits.
+"""
+
+import argparse
+import copy
+import io
+import json
+import math
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import streamlit.logger
+
+import DropShipping as app
+
+# The client AppTest runs use; set before each AppTest script run
+ACTIVE_CLIENT = None
+
+ORDER_STATUSES = ["pending", "processing", "shipped", "delivered", "cancelled"]
+CATEGORIES = ["Electronics", "Home", "Outdoors", "Toys", "Online Courses", None]
+
+# ========================================
+# IN-MEMORY SUPABASE STAND-IN
+# ========================================
+
+class FakeAPIError(Exception):
+    """Mimics postgrest's APIError raised for a failed request"""
+
+    def __init__(self, message, code="P0001"):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+class FakeResponse:
+    """Mimics the postgrest APIResponse fields the app reads"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+def _split_top_level(text):
+    """Split a PostgREST select/or_ expression on commas outside parentheses and quotes"""
+    parts, current, depth, quoted = [], "", 0, False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if quoted and ch == "\\" and i + 1 < len(text):
+            current += text[i:i + 2]
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append(current.strip())
+            current = ""
+        else:
+            current += ch
+        i += 1
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+def _unquote(value):
+    """Strip PostgREST double quotes and backslash escapes from a filter value"""
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+def _like_matches(pattern, value, case_insensitive):
+    """Evaluate a SQL LIKE pattern (with backslash escapes) against value"""
+    regex, i = "", 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern):
+            regex += re.escape(pattern[i + 1])
+            i += 2
+            continue
+        regex += ".*" if ch in "%*" else "." if ch == "_" else re.escape(ch)
+        i += 1
+    flags = re.S | (re.I if case_insensitive else 0)
+    return re.fullmatch(regex, str(value), flags) is not None
+
+def _compare(op, left, right):
+    """Evaluate one PostgREST comparison operator"""
+    if op == "is":
+        return {"null": None, "true": True, "false": False}[right] is left
+    if left is None:
+        return False
+    if op in ("like", "ilike"):
+        return _like_matches(right, left, op == "ilike")
+    if isinstance(right, str) and isinstance(left, (int, float)) and not isinstance(left, bool):
+        right = type(left)(right)
+    return {
+        "eq": left == right,
+        "neq": left != right,
+        "lt": left < right,
+        "lte": left <= right,
+        "gt": left > right,
+        "gte": left >= right
+    }[op]
+
+def _logic_condition(expression):
+    """Compile an or_()/and() logic tree into a row predicate"""
+    if expression.startswith(("and(", "or(")):
+        kind, inner = expression.split("(", 1)
+        conditions = [_logic_condition(part) for part in _split_top_level(inner[:-1])]
+        combine = all if kind == "and" else any
+        return lambda row: combine(condition(row) for condition in conditions)
+
+    column, op, value = expression.split(".", 2)
+    value = _unquote(value)
+    if op == "in":
+        values = [_unquote(v) for v in _split_top_level(value[1:-1])]
+        return lambda row: str(row.get(column)) in values
+    if op == "not" and value.startswith("in."):
+        values = [_unquote(v) for v in _split_top_level(value[4:-1])]
+        return lambda row: str(row.get(column)) not in values
+    return lambda row: _compare(op, row.get(column), value)
+
+class FakeQuery:
+    """Chainable query builder covering the postgrest surface DropShipping.py uses"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.offset = 0
+        self.count = None
+        self.on_conflict = "id"
+        self.ignore_duplicates = False
+
+    # Actions
+
+    def select(self, *columns, count=None, head=None):
+        self.action = "select"
+        self.columns = ", ".join(columns) or "*"
+        self.count = count
+        return self
+
+    def insert(self, payload, **kwargs):
+        self.action, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict="", ignore_duplicates=False, **kwargs):
+        self.action, self.payload = "upsert", payload
+        self.on_conflict = on_conflict or "id"
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, payload, **kwargs):
+        self.action, self.payload = "update", payload
+        return self
+
+    def delete(self, **kwargs):
+        self.action = "delete"
+        return self
+
+    # Filters and modifiers
+
+    def _where(self, column, op, value):
+        self.filters.append(lambda row: _compare(op, row.get(column), value))
+        return self
+
+    def eq(self, column, value):
+        return self._where(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._where(column, "neq", value)
+
+    def lt(self, column, value):
+        return self._where(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._where(column, "lte", value)
+
+    def gt(self, column, value):
+        return self._where(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._where(column, "gte", value)
+
+    def like(self, column, value):
+        return self._where(column, "like", value)
+
+    def ilike(self, column, value):
+        return self._where(column, "ilike", value)
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, expression, **kwargs):
+        conditions = [_logic_condition(part) for part in _split_top_level(expression)]
+        self.filters.append(lambda row: any(condition(row) for condition in conditions))
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count, **kwargs):
+        self.limit_count = count
+        return self
+
+    def range(self, start, end, **kwargs):
+        self.offset, self.limit_count = start, end - start + 1
+        return self
+
+    # Execution
+
+    def _matching(self):
+        rows = self.client.tables.setdefault(self.table, [])
+        return [row for row in rows if all(condition(row) for condition in self.filters)]
+
+    def execute(self):
+        response = getattr(self, f"_execute_{self.action}")()
+        self.client.record(self.table, response.data)
+        return response
+
+    def _execute_select(self):
+        if self.table in self.client.views:
+            rows = [row for row in self.client.views[self.table](self.client)
+                    if all(condition(row) for condition in self.filters)]
+        else:
+            rows = self._matching()
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        total = len(rows)
+        rows = rows[self.offset:]
+        if self.limit_count is not None:
+            rows = rows[:self.limit_count]
+        data = [self.client.project(self.table, row, self.columns) for row in rows]
+        return FakeResponse(data, total if self.count else None)
+
+    def _execute_insert(self):
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]
+        return FakeResponse(copy.deepcopy([self.client.insert_row(self.table, row) for row in payload]))
+
+    def _execute_upsert(self):
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]
+        index = {row.get(self.on_conflict): row for row in self.client.tables.setdefault(self.table, [])}
+        returned = []
+        for row in payload:
+            existing = index.get(row.get(self.on_conflict))
+            if existing is None:
+                returned.append(self.client.insert_row(self.table, row))
+            elif not self.ignore_duplicates:
+                existing.update(row, updated_at=self.client.now())
+                returned.append(existing)
+        return FakeResponse(copy.deepcopy(returned))
+
+    def _execute_update(self):
+        rows = self._matching()
+        for row in rows:
+            row.update(self.payload, updated_at=self.client.now())
+        return FakeResponse(copy.deepcopy(rows))
+
+    def _execute_delete(self):
+        doomed = self._matching()
+        doomed_ids = {id(row) for row in doomed}
+        self.client.tables[self.table] = [row for row in self.client.tables[self.table] if id(row) not in doomed_ids]
+        self.client.cascade_delete(self.table, {row['id'] for row in doomed})
+        return FakeResponse(copy.deepcopy(doomed))
+
+class FakeRpc:
+    """Pending call to one of the stand-in's SQL functions"""
+
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params or {}
+
+    def execute(self):
+        data = self.client.functions[self.name](self.client, **self.params)
+        self.client.record(f"rpc:{self.name}", data)
+        return FakeResponse(data)
+
+class FakeSupabase:
+    """
+    In-memory stand-in for the Supabase client.
+
+    Implements table()/rpc() with the filters, ordering, embedded selects,
+    views and SQL functions from the Setup Instructions, and counts every
+    request and returned row.
+    """
+
+    def __init__(self, tables=None):
+        self.tables = tables if tables is not None else {"customers": [], "products": [], "orders": []}
+        self.requests = 0
+        self.rows_returned = 0
+        self._clock = datetime(2024, 1, 1)
+        self.views = {
+            "order_totals": _view_order_totals,
+            "order_status_summary": _view_order_status_summary,
+            "inventory_valuation": _view_inventory_valuation,
+            "daily_sales": _view_daily_sales,
+            "daily_sales_trend": _view_daily_sales_trend
+        }
+        self.functions = {
+            "top_products_by_revenue": _function_top_products_by_revenue,
+            "place_order": _function_place_order,
+            "place_order_group": _function_place_order_group
+        }
+
+    def record(self, table, data):
+        self.requests += 1
+        self.rows_returned += len(data) if isinstance(data, list) else 1
+
+    def now(self):
+        self._clock += timedelta(seconds=1)
+        return self._clock.isoformat()
+
+    def insert_row(self, table, row):
+        rows = self.tables.setdefault(table, [])
+        row = dict(row)
+        row.setdefault("id", (rows[-1]["id"] + 1) if rows else 1)
+        row.setdefault("created_at", self.now())
+        row.setdefault("updated_at", row["created_at"])
+        rows.append(row)
+        return row
+
+    def cascade_delete(self, table, row_ids):
+        """Mirror the ON DELETE CASCADE foreign keys on orders"""
+        foreign_key = {"customers": "customer_id", "products": "product_id"}.get(table)
+        if foreign_key and row_ids:
+            self.tables["orders"] = [o for o in self.tables["orders"] if o.get(foreign_key) not in row_ids]
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        return FakeRpc(self, name, params)
+
+    def project(self, table, row, columns):
+        """Apply a select expression, resolving embedded customers(...)/products(...)"""
+        result = {}
+        for part in _split_top_level(columns):
+            if part == "*":
+                result.update(row)
+            elif "(" in part:
+                embedded, inner = part[:-1].split("(", 1)
+                target_id = row.get(f"{embedded[:-1]}_id")
+                target = self.lookup(embedded, target_id)
+                result[embedded] = self.project(embedded, target, inner) if target else None
+            else:
+                result[part] = row.get(part)
+        return result
+
+    def lookup(self, table, row_id):
+        """Find a row by id (tables are kept in id order, so bisect by position first)"""
+        rows = self.tables.get(table, [])
+        if row_id is not None and 0 < row_id <= len(rows) and rows[row_id - 1]["id"] == row_id:
+            return rows[row_id - 1]
+        return next((row for row in rows if row["id"] == row_id), None)
+
+def _view_order_totals(client):
+    orders = client.tables["orders"]
+    return [{"order_count": len(orders), "total_revenue": sum(o["total_amount"] for o in orders)}]
+
+def _view_order_status_summary(client):
+    summary = {}
+    for order in client.tables["orders"]:
+        row = summary.setdefault(order["status"], {"status": order["status"], "order_count": 0, "revenue": 0.0})
+        row["order_count"] += 1
+        row["revenue"] += order["total_amount"]
+    return list(summary.values())
+
+def _view_inventory_valuation(client):
+    products = client.tables["products"]
+    return [{
+        "product_count": len(products),
+        "units_in_stock": sum(p["stock_quantity"] for p in products),
+        "inventory_value": sum(p["price"] * p["stock_quantity"] for p in products)
+    }]
+
+def _view_daily_sales(client):
+    """The rollup the orders trigger maintains, rebuilt on read (the fake has no triggers)"""
+    rollup = {}
+    for order in client.tables["orders"]:
+        key = (order["created_at"][:10], order["product_id"], order["status"])
+        row = rollup.setdefault(key, dict(zip(("day", "product_id", "status"), key),
+                                          order_count=0, quantity=0, revenue=0.0))
+        row["order_count"] += 1
+        row["quantity"] += order["quantity"]
+        row["revenue"] += order["total_amount"]
+    return list(rollup.values())
+
+def _view_daily_sales_trend(client):
+    trend = {}
+    for row in _view_daily_sales(client):
+        day = trend.setdefault(row["day"], {"day": row["day"], "order_count": 0, "quantity": 0, "revenue": 0.0})
+        for column in ("order_count", "quantity", "revenue"):
+            day[column] += row[column]
+    return list(trend.values())
+
+def _function_place_order(client, p_customer_id, p_product_id, p_quantity, p_status="pending",
+                          p_tracking_number=None, p_notes=None):
+    product = client.lookup("products", p_product_id)
+    if product is None:
+        raise FakeAPIError(f"Product {p_product_id} does not exist")
+    if product["stock_quantity"] < p_quantity:
+        raise FakeAPIError(f"Insufficient stock for {product['name']}: "
+                           f"{product['stock_quantity']} left, {p_quantity} requested")
+    product.update(stock_quantity=product["stock_quantity"] - p_quantity, updated_at=client.now())
+    return client.insert_row("orders", {
+        "customer_id": p_customer_id,
+        "product_id": p_product_id,
+        "quantity": p_quantity,
+        "total_amount": round(product["price"] * p_quantity, 2),
+        "status": p_status,
+        "tracking_number": p_tracking_number,
+        "notes": p_notes
+    })
+
+def _function_place_order_group(client, p_customer_id, p_items, p_status="pending", p_notes=None):
+    if not p_items:
+        raise FakeAPIError("The cart is empty")
+    wanted = {}
+    for item in p_items:
+        wanted[item["product_id"]] = wanted.get(item["product_id"], 0) + item["quantity"]
+    products = {product_id: client.lookup("products", product_id) for product_id in wanted}
+    problems = [
+        f"{product['name'] if product else f'product {product_id}'}: "
+        f"{product['stock_quantity'] if product else 0} left, {wanted[product_id]} requested"
+        for product_id, product in products.items()
+        if product is None or product["stock_quantity"] < wanted[product_id]
+    ]
+    if problems:
+        raise FakeAPIError(f"Insufficient stock for {'; '.join(problems)}")
+
+    for product_id, product in products.items():
+        product.update(stock_quantity=product["stock_quantity"] - wanted[product_id], updated_at=client.now())
+    group = client.insert_row("order_groups", {"customer_id": p_customer_id, "total_amount": 0})
+    orders = [
+        client.insert_row("orders", {
+            "customer_id": p_customer_id,
+            "product_id": item["product_id"],
+            "quantity": item["quantity"],
+            "total_amount": round(products[item["product_id"]]["price"] * item["quantity"], 2),
+            "status": p_status,
+            "tracking_number": None,
+            "notes": p_notes,
+            "group_id": group["id"]
+        })
+        for item in p_items
+    ]
+    group["total_amount"] = sum(order["total_amount"] for order in orders)
+    return orders
+
+def _function_top_products_by_revenue(client, limit_count=5):
+    sales = {}
+    for order in client.tables["orders"]:
+        row = sales.setdefault(order["product_id"], {"product_id": order["product_id"], "quantity": 0, "revenue": 0.0})
+        row["quantity"] += order["quantity"]
+        row["revenue"] += order["total_amount"]
+    top = sorted(sales.values(), key=lambda row: row["revenue"], reverse=True)[:limit_count]
+    for row in top:
+        product = client.lookup("products", row["product_id"])
+        row["name"] = product["name"] if product else None
+    return top
+
+# ========================================
+# SYNTHETIC DATA
+# ========================================
+
+def generate_dataset(customers=10_000, products=2_000, orders=50_000, seed=42):
+    """Build customers, products and orders tables with realistic-looking rows"""
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    span = 365 * 24 * 3600
+
+    def timestamp(i, total):
+        return (start + timedelta(seconds=span * i / max(total, 1))).isoformat()
+
+    customer_rows = [
+        {
+            "id": i,
+            "name": f"Customer {i:06d}",
+            "email": f"customer{i}@example.com",
+            "phone": f"555{rng.randint(1000000, 9999999)}",
+            "address": f"{rng.randint(1, 9999)} Main St, Apt {rng.randint(1, 99)}",
+            "city": rng.choice(["New York", "Austin", "Denver", "Seattle", "Miami"]),
+            "state": rng.choice(["NY", "TX", "CO", "WA", "FL"]),
+            "zip_code": f"{rng.randint(10000, 99999)}",
+            "country": "USA",
+            "created_at": timestamp(i, customers),
+            "updated_at": timestamp(i, customers)
+        }
+        for i in range(1, customers + 1)
+    ]
+
+    product_rows = []
+    for i in range(1, products + 1):
+        price = round(rng.uniform(5, 500), 2)
+        product_rows.append({
+            "id": i,
+            "name": f"Product {i:05d}",
+            "sku": f"SKU-{i:05d}",
+            "description": "Lorem ipsum dolor sit amet. " * rng.randint(5, 40),
+            "price": price,
+            "cost": round(price * rng.uniform(0.3, 0.8), 2),
+            "stock_quantity": rng.randint(0, 500),
+            "supplier_name": f"Supplier {rng.randint(1, 50)}",
+            "supplier_url": f"https://supplier.example.com/products/{i}",
+            "category": rng.choice(CATEGORIES),
+            "created_at": timestamp(i, products),
+            "updated_at": timestamp(i, products)
+        })
+
+    order_rows = []
+    for i in range(1, orders + 1):
+        product = product_rows[rng.randrange(products)]
+        quantity = rng.randint(1, 5)
+        order_rows.append({
+            "id": i,
+            "customer_id": rng.randint(1, customers),
+            "product_id": product["id"],
+            "quantity": quantity,
+            "total_amount": round(product["price"] * quantity, 2),
+            "status": rng.choice(ORDER_STATUSES),
+            "tracking_number": f"TRK{i:08d}" if rng.random() < 0.5 else None,
+            "notes": None,
+            "created_at": timestamp(i, orders),
+            "updated_at": timestamp(i, orders)
+        })
+
+    return {"customers": customer_rows, "products": product_rows, "orders": order_rows}
+
+# ========================================
+# SCENARIOS
+# ========================================
+
+def _first_page_cursor(client, reader):
+    """Cursor of page 2, for scenarios that navigate past the first page"""
+    rows, next_cursor = reader(client, app.PAGE_SIZE_OPTIONS[0])
+    return next_cursor
+
+def _delta_sync_scenario(client):
+    """Steady-state delta refresh of orders: one row changes, the local copy catches up"""
+    orders = app.TableSync("orders")
+    orders.refresh(client)
+    order_ids = [order['id'] for order in client.tables["orders"][:100]]
+
+    def run():
+        client.table("orders").update({"status": "shipped"}).eq("id", random.choice(order_ids)).execute()
+        orders.stale = True
+        orders.refresh(client)
+        return orders.snapshot()
+    return run
+
+def build_scenarios(client, tmp_dir):
+    """Map scenario name -> zero-argument callable running one page's data path"""
+    page_two = {
+        "customers": _first_page_cursor(client, app.get_customers_page),
+        "products": _first_page_cursor(client, app.get_products_page)
+    }
+    courses = [
+        {"title": f"Course {i}", "slug": f"bench-course-{i}", "description": "Benchmark course",
+         "teacher": {"name": "Bench Teacher"}}
+        for i in range(200)
+    ]
+    app.REPLICA_PATH = os.path.join(tmp_dir, "replica.db")
+    last_order = max((order["created_at"] for order in client.tables["orders"]), default="2024-01-01")
+    trend_until = date.fromisoformat(last_order[:10])
+    trend_since = trend_until - timedelta(days=89)
+    stocked_product = max(client.tables["products"], key=lambda p: p["stock_quantity"])["id"]
+    customer_file = "name,email,phone,address,city\n" + "".join(
+        f"Imported {i},imported{i}@example.com,555-010-{i % 10000:04d},{i} Import St,Austin\n" for i in range(2000)
+    )
+
+    return {
+        "customers: list page 1": lambda: app.get_customers_page(client, 25),
+        "customers: list page 2": lambda: app.get_customers_page(client, 25, page_two["customers"]),
+        "customers: search": lambda: app.search_customers(client, "customer 00012"),
+        "products: list page 1": lambda: app.get_products_page(client, 25),
+        "products: list page 2": lambda: app.get_products_page(client, 25, page_two["products"]),
+        "products: inventory value": lambda: app.get_inventory_valuation(client),
+        "dashboard: low stock alerts": lambda: app.get_low_stock_products(client),
+        "orders: list page (open statuses)": lambda: app.get_orders_page(
+            client, 25, None, ["pending", "processing", "shipped"]
+        ),
+        "orders: pending this week (count + page)": lambda: (
+            app.count_orders(client, ["pending"], trend_until - timedelta(days=6), trend_until + timedelta(days=1)),
+            app.get_orders_page(client, 25, None, ["pending"], trend_until - timedelta(days=6),
+                                trend_until + timedelta(days=1))
+        ),
+        "orders: form pickers": lambda: (
+            app.search_customer_options(client, "customer 0001"),
+            app.search_product_options(client, "sku-0001")
+        ),
+        "dashboard: database aggregates": lambda: app.get_dashboard_metrics(client),
+        "dashboard: client aggregates": lambda: app.compute_dashboard_metrics(
+            app.get_all_customers(client, app.CUSTOMER_COLUMNS["count"]),
+            app.get_all_products(client, app.PRODUCT_COLUMNS["options"]),
+            app.get_all_orders(client)
+        ),
+        "dashboard: replica": lambda: app.get_replica_dashboard_metrics(client),
+        "dashboard: 90-day sales trend (database)": lambda: app.get_daily_sales_trend(client, trend_since),
+        "dashboard: 90-day sales trend (client)": lambda: app.daily_sales_trend(
+            app.build_orders_frame(app.get_all_orders(client)), trend_since
+        ),
+        "dashboard: 90-day sales trend (replica)": lambda: app.get_replica_daily_sales_trend(client, trend_since),
+        "sync: orders delta refresh": _delta_sync_scenario(client),
+        "export: orders to CSV": lambda: app.export_table(client, "orders", os.path.join(tmp_dir, "orders.csv")),
+        "orders: place order": lambda: app.place_order(client, 1, stocked_product, 1),
+        "orders: checkout 10-item cart": lambda: app.place_order_group(
+            client, 1, [{"product_id": stocked_product, "quantity": 1}] * 10
+        ),
+        "import: 2,000 customers from CSV": lambda: app.import_file(
+            client, "customers", io.StringIO(customer_file)
+        ),
+        "platzi: bulk import 200 courses": lambda: app.bulk_import_platzi_courses(client, courses, 49.99)
+    }
+
+def _p95(timings):
+    """Nearest-rank 95th percentile"""
+    return sorted(timings)[math.ceil(len(timings) * 0.95) - 1]
+
+def run_scenario(client, action, repeat):
+    """Time action repeat times from a cold session cache; return summary stats"""
+    timings = []
+    requests_before, rows_before = client.requests, client.rows_returned
+    for _ in range(repeat):
+        app._get_data_cache().clear()
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "mean_ms": statistics.mean(timings),
+        "p95_ms": _p95(timings),
+        "requests": (client.requests - requests_before) / repeat,
+        "rows": (client.rows_returned - rows_before) / repeat
+    }
+
+# ========================================
+# STREAMLIT PAGES (AppTest)
+# ========================================
+
+APPTEST_SCRIPT = """
+import sys
+sys.path.insert(0, {repo_dir!r})
+import benchmark
+import DropShipping
+DropShipping.init_supabase = lambda: benchmark.ACTIVE_CLIENT
+DropShipping.main()
+"""
+
+def run_apptest_pages(client, repeat):
+    """Render every sidebar page through streamlit.testing AppTest, cold then warm"""
+    from streamlit.testing.v1 import AppTest
+    import benchmark as shared  # the module AppTest scripts import, even when run as __main__
+
+    shared.ACTIVE_CLIENT = client
+    script = APPTEST_SCRIPT.format(repo_dir=os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+
+    pages = AppTest.from_string(script, default_timeout=600).run().sidebar.radio[0].options
+    streamlit.logger.set_log_level("error")  # AppTest reapplies the config's log level
+    for page in pages:
+        at = AppTest.from_string(script, default_timeout=600).run()
+        for phase in ("cold", "warm"):
+            timings = []
+            requests_before, rows_before = client.requests, client.rows_returned
+            runs = 1 if phase == "cold" else repeat
+            for _ in range(runs):
+                started = time.perf_counter()
+                at.sidebar.radio[0].set_value(page).run()
+                timings.append((time.perf_counter() - started) * 1000)
+            if at.exception:
+                raise RuntimeError(f"{page} raised: {at.exception[0].value}")
+            results[f"page {page.split(' ', 1)[1]} ({phase})"] = {
+                "mean_ms": statistics.mean(timings),
+                "p95_ms": _p95(timings),
+                "requests": (client.requests - requests_before) / runs,
+                "rows": (client.rows_returned - rows_before) / runs
+            }
+    return results
+
+# ========================================
+# REPORTING
+# ========================================
+
+def format_results(results, baseline=None):
+    """Render results (and optional deltas against a baseline) as a Markdown table"""
+    header = "| Scenario | Mean ms | p95 ms | Requests | Rows |"
+    divider = "|---|---:|---:|---:|---:|"
+    if baseline:
+        header += " Δ Mean |"
+        divider += "---:|"
+
+    lines = [header, divider]
+    for name, stats in results.items():
+        line = (f"| {name} | {stats['mean_ms']:.2f} | {stats['p95_ms']:.2f} | "
+                f"{stats['requests']:.1f} | {stats['rows']:.0f} |")
+        if baseline:
+            before = baseline.get(name)
+            if before and before["mean_ms"]:
+                line += f" {(stats['mean_ms'] / before['mean_ms'] - 1) * 100:+.1f}% |"
+            else:
+                line += " n/a |"
+        lines.append(line)
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=2_000)
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON for later --compare")
+    parser.add_argument("--compare", metavar="PATH", help="Show deltas against a previous --json run")
+    parser.add_argument("--skip-apptest", action="store_true", help="Only time the data functions")
+    args = parser.parse_args(argv)
+
+    streamlit.logger.set_log_level("error")
+
+    started = time.perf_counter()
+    dataset = generate_dataset(args.customers, args.products, args.orders, args.seed)
+    print(f"Generated {args.customers:,} customers, {args.products:,} products, "
+          f"{args.orders:,} orders in {time.perf_counter() - started:.1f}s")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Wrapped like init_supabase() does, so the retry proxy's overhead is included
+        client = app.ResilientSupabase(FakeSupabase(copy.deepcopy(dataset)))
+        for name, action in build_scenarios(client, tmp_dir).items():
+            results[name] = run_scenario(client, action, args.repeat)
+
+        if not args.skip_apptest:
+            results.update(run_apptest_pages(app.ResilientSupabase(FakeSupabase(copy.deepcopy(dataset))), args.repeat))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print(format_results(results, baseline))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"params": vars(args), "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    sys.exit(main())